@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+import os
+import shutil
+import tempfile
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import Dict, List, Protocol
 
 from doc_translator.translator import TranslatorProtocol
 from doc_translator.glossary import Glossary
 
 
+ZIP_COPY_BUFFER_SIZE = 1 << 20
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+
+
 @dataclass
 class ProcessStats:
     segments_total: int = 0
@@ -28,3 +36,65 @@ class FileAdapter(Protocol):
         progress_callback: Callable[[int, int], None] | None = None,
     ) -> ProcessStats:
         ...
+
+
+def translate_deduplicated(
+    translator: TranslatorProtocol,
+    texts: List[str],
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> List[str]:
+    unique: Dict[str, int] = {}
+    order: List[str] = []
+    for text in texts:
+        if text not in unique:
+            unique[text] = len(order)
+            order.append(text)
+
+    if len(order) == len(texts):
+        return translator.translate(texts, progress_callback=progress_callback)
+
+    total = len(texts)
+    unique_total = len(order)
+    translated_unique = translator.translate(
+        order,
+        progress_callback=(
+            (lambda done, _total: progress_callback(done * total // unique_total, total))
+            if progress_callback
+            else None
+        ),
+    )
+    return [translated_unique[unique[text]] for text in texts]
+
+
+def rewrite_zip(input_file: Path, output_file: Path, replacements: Dict[str, bytes]) -> None:
+    # A unique temp name per call, so concurrent writers never share a partial file.
+    fd, temp_name = tempfile.mkstemp(prefix=f".{output_file.name}.", suffix=".tmp", dir=output_file.parent)
+    os.close(fd)
+    temp_file = Path(temp_name)
+    try:
+        with zipfile.ZipFile(input_file, "r") as zin, zipfile.ZipFile(
+            temp_file, "w", compression=zipfile.ZIP_DEFLATED
+        ) as zout:
+            for info in zin.infolist():
+                payload = replacements.get(info.filename)
+                if payload is not None:
+                    zout.writestr(_copy_zip_info(info), payload)
+                elif info.is_dir():
+                    zout.writestr(_copy_zip_info(info), b"")
+                else:
+                    with zin.open(info) as source, zout.open(_copy_zip_info(info), "w") as target:
+                        shutil.copyfileobj(source, target, ZIP_COPY_BUFFER_SIZE)
+        temp_file.replace(output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def _copy_zip_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    copied = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    copied.compress_type = info.compress_type
+    copied.comment = info.comment
+    copied.create_system = info.create_system
+    copied.external_attr = info.external_attr
+    copied.file_size = info.file_size
+    return copied
@@ -1,28 +1,53 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-import shutil
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from lxml import etree as ET
+
 from doc_translator.adapters.base import ProcessStats
+from doc_translator.adapters.base import XML_DECLARATION
+from doc_translator.adapters.base import rewrite_zip
+from doc_translator.adapters.base import translate_deduplicated
 from doc_translator.glossary import Glossary
 from doc_translator.translator import TranslatorProtocol
 
 
 W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MAX_PART_WORKERS = 8
+_W_T_XPATH = ET.XPath("//w:t", namespaces={"w": W_NS})
 
 
 @dataclass
 class NodeRef:
     part_name: str
-    node: ET.Element
+    node: ET._Element
     placeholders: Dict[str, str]
 
 
+class _ProgressForwarder:
+    __slots__ = ("callback", "total", "translated", "part_done", "lock")
+
+    def __init__(self, callback: Callable[[int, int], None], total: int, parts: int):
+        self.callback = callback
+        self.total = total
+        self.translated = 0
+        self.part_done = [0] * parts
+        self.lock = threading.Lock()
+
+    def update(self, part_index: int, done: int, _total: int) -> None:
+        with self.lock:
+            self.translated += done - self.part_done[part_index]
+            self.part_done[part_index] = done
+            self.callback(self.translated, self.total)
+
+
 class DocxAdapter:
     suffixes = (".docx",)
 
@@ -35,72 +60,72 @@ class DocxAdapter:
         progress_callback: Callable[[int, int], None] | None = None,
     ) -> ProcessStats:
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(input_file, output_file)
 
         stats = ProcessStats()
 
-        with zipfile.ZipFile(output_file, "r") as zin:
-            files = {name: zin.read(name) for name in zin.namelist()}
-
-        part_names = [
-            name
-            for name in files.keys()
-            if name.startswith("word/") and name.endswith(".xml") and _is_translatable_part(name)
-        ]
+        with zipfile.ZipFile(input_file, "r") as zin:
+            part_names = [
+                name
+                for name in zin.namelist()
+                if name.startswith("word/") and name.endswith(".xml") and _is_translatable_part(name)
+            ]
+            part_payloads = {name: zin.read(name) for name in part_names}
 
-        part_tasks: List[Tuple[str, ET.Element, List[NodeRef], List[str]]] = []
+        part_tasks: List[Tuple[str, ET._Element, List[NodeRef], List[str]]] = []
         total_segments = 0
+        glossary_hits = 0
 
         for part_name in part_names:
-            xml_bytes = files[part_name]
+            xml_bytes = part_payloads.pop(part_name)
             root = ET.fromstring(xml_bytes)
-            text_nodes = [node for node in root.iter(f"{{{W_NS}}}t") if (node.text or "").strip()]
+            text_nodes = [node for node in _W_T_XPATH(root) if (node.text or "").strip()]
             if not text_nodes:
                 continue
 
-            source_texts: List[str] = []
-            refs: List[NodeRef] = []
-
-            for node in text_nodes:
-                original = node.text or ""
-                prepared, placeholders, lock_hits = glossary.preprocess_locks(original)
-                source_texts.append(prepared)
-                refs.append(NodeRef(part_name=part_name, node=node, placeholders=placeholders))
-                stats.glossary_hits += lock_hits
+            source_texts, placeholders_list, lock_hits = glossary.preprocess_locks_batch([node.text or "" for node in text_nodes])
+            refs = [
+                NodeRef(part_name=part_name, node=node, placeholders=placeholders)
+                for node, placeholders in zip(text_nodes, placeholders_list)
+            ]
+            glossary_hits += sum(lock_hits)
 
             total_segments += len(source_texts)
             part_tasks.append((part_name, root, refs, source_texts))
 
-        translated_so_far = 0
         if progress_callback and total_segments == 0:
             progress_callback(0, 0)
 
-        for part_name, root, refs, source_texts in part_tasks:
-            translated = translator.translate(
-                source_texts,
-                progress_callback=(
-                    (lambda done, _total, translated_so_far=translated_so_far: progress_callback(translated_so_far + done, total_segments))
-                    if progress_callback
-                    else None
-                ),
-            )
-
-            for idx, translated_text in enumerate(translated):
-                restored, hits = glossary.postprocess(translated_text, refs[idx].placeholders)
-                refs[idx].node.text = restored
-                stats.glossary_hits += hits
-
-            stats.segments_total += len(source_texts)
-            stats.segments_translated += len(source_texts)
-            files[part_name] = ET.tostring(root, encoding="utf-8", xml_declaration=True)
-            translated_so_far += len(source_texts)
+        forwarder = _ProgressForwarder(progress_callback, total_segments, len(part_tasks)) if progress_callback else None
+
+        translated_parts: List[List[str]] = []
+        if part_tasks:
+            with ThreadPoolExecutor(max_workers=min(len(part_tasks), MAX_PART_WORKERS)) as executor:
+                futures = [
+                    executor.submit(
+                        translate_deduplicated,
+                        translator,
+                        source_texts,
+                        partial(forwarder.update, part_index) if forwarder else None,
+                    )
+                    for part_index, (_part_name, _root, _refs, source_texts) in enumerate(part_tasks)
+                ]
+                translated_parts = [future.result() for future in futures]
+
+        for (part_name, root, refs, _source_texts), translated in zip(part_tasks, translated_parts):
+            for ref, translated_text in zip(refs, translated):
+                restored, hits = glossary.postprocess(translated_text, ref.placeholders)
+                ref.node.text = restored
+                glossary_hits += hits
+            part_payloads[part_name] = XML_DECLARATION + ET.tostring(root, encoding="utf-8", xml_declaration=False)
+
+        stats.glossary_hits += glossary_hits
+        stats.segments_total += total_segments
+        stats.segments_translated += total_segments
 
         if progress_callback and total_segments > 0:
             progress_callback(total_segments, total_segments)
 
-        with zipfile.ZipFile(output_file, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-            for name, payload in files.items():
-                zout.writestr(name, payload)
+        rewrite_zip(input_file, output_file, part_payloads)
 
         return stats
 
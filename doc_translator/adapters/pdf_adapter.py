@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from pathlib import Path
-from typing import Dict, List, Tuple
+import threading
+from typing import List, Tuple
 
 import fitz
 
 from doc_translator.adapters.base import ProcessStats
+from doc_translator.adapters.base import translate_deduplicated
 from doc_translator.glossary import Glossary
 from doc_translator.translator import TranslatorProtocol
 
 
+# PyMuPDF is not thread-safe; document access is serialized, translation is not.
+_FITZ_LOCK = threading.Lock()
+
+
 class PdfAdapter:
     suffixes = (".pdf",)
 
@@ -24,58 +30,65 @@ class PdfAdapter:
     ) -> ProcessStats:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        doc = fitz.open(input_file)
         stats = ProcessStats()
+        page_blocks: List[Tuple[fitz.Page, List[fitz.Rect]]] = []
+        raw_texts: List[str] = []
 
-        page_blocks: Dict[int, List[Tuple[fitz.Rect, Dict[str, str]]]] = {}
-        all_source_texts: List[str] = []
+        with _FITZ_LOCK:
+            doc = fitz.open(input_file)
+            for page in doc:
+                blocks = page.get_text("blocks")
+                translatable_blocks: List[fitz.Rect] = []
 
-        for page_index, page in enumerate(doc):
-            blocks = page.get_text("blocks")
-            translatable_blocks: List[Tuple[fitz.Rect, Dict[str, str]]] = []
+                for block in blocks:
+                    x0, y0, x1, y1, text, _block_no, block_type = block
+                    if int(block_type) != 0:
+                        continue
+                    raw = (text or "").strip()
+                    if not raw:
+                        continue
 
-            for block in blocks:
-                x0, y0, x1, y1, text, _block_no, block_type = block
-                if int(block_type) != 0:
-                    continue
-                raw = (text or "").strip()
-                if not raw:
-                    continue
+                    translatable_blocks.append(fitz.Rect(x0, y0, x1, y1))
+                    raw_texts.append(raw)
 
-                prepared, placeholders, lock_hits = glossary.preprocess_locks(raw)
-                translatable_blocks.append((fitz.Rect(x0, y0, x1, y1), placeholders))
-                all_source_texts.append(prepared)
-                stats.glossary_hits += lock_hits
+                if translatable_blocks:
+                    page_blocks.append((page, translatable_blocks))
 
-            if translatable_blocks:
-                page_blocks[page_index] = translatable_blocks
+        all_source_texts, placeholders_list, lock_hits = glossary.preprocess_locks_batch(raw_texts)
+        stats.glossary_hits += sum(lock_hits)
 
         if not all_source_texts:
             if progress_callback:
                 progress_callback(0, 0)
-            doc.save(output_file)
-            doc.close()
+            with _FITZ_LOCK:
+                doc.save(output_file)
+                doc.close()
             return stats
 
-        translated = translator.translate(all_source_texts, progress_callback=progress_callback)
+        translated = translate_deduplicated(translator, all_source_texts, progress_callback=progress_callback)
 
+        segment_count = len(all_source_texts)
+        glossary_hits = 0
         cursor = 0
-        for page_index in sorted(page_blocks.keys()):
-            page = doc[page_index]
-            translatable_blocks = page_blocks[page_index]
-            translated_slice = translated[cursor : cursor + len(translatable_blocks)]
-            for index, translated_text in enumerate(translated_slice):
-                rect, placeholders = translatable_blocks[index]
-                restored, hits = glossary.postprocess(translated_text, placeholders)
-                stats.glossary_hits += hits
-                page.add_redact_annot(rect, fill=(1, 1, 1))
+        with _FITZ_LOCK:
+            for page, translatable_blocks in page_blocks:
+                for rect in translatable_blocks:
+                    page.add_redact_annot(rect, fill=(1, 1, 1))
                 page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
-                page.insert_textbox(rect, restored, fontsize=10, color=(0, 0, 0), align=fitz.TEXT_ALIGN_LEFT)
-            cursor += len(translatable_blocks)
 
-        stats.segments_total += len(all_source_texts)
-        stats.segments_translated += len(all_source_texts)
+                end = cursor + len(translatable_blocks)
+                for rect, translated_text, placeholders in zip(
+                    translatable_blocks, translated[cursor:end], placeholders_list[cursor:end]
+                ):
+                    restored, hits = glossary.postprocess(translated_text, placeholders)
+                    glossary_hits += hits
+                    page.insert_textbox(rect, restored, fontsize=10, color=(0, 0, 0), align=fitz.TEXT_ALIGN_LEFT)
+                cursor = end
+
+            doc.save(output_file)
+            doc.close()
 
-        doc.save(output_file)
-        doc.close()
+        stats.glossary_hits += glossary_hits
+        stats.segments_total += segment_count
+        stats.segments_translated += segment_count
         return stats
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+import zipfile
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List
 
-from openpyxl import load_workbook
+from lxml import etree as ET
 
 from doc_translator.adapters.base import ProcessStats
+from doc_translator.adapters.base import XML_DECLARATION
+from doc_translator.adapters.base import rewrite_zip
+from doc_translator.adapters.base import translate_deduplicated
 from doc_translator.glossary import Glossary
 from doc_translator.translator import TranslatorProtocol
 
 
+S_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+_SHARED_ITEM_XPATH = ET.XPath("/s:sst/s:si", namespaces={"s": S_NS})
+_INLINE_ITEM_XPATH = ET.XPath("//s:c[@t='inlineStr']/s:is", namespaces={"s": S_NS})
+_ITEM_TEXT_XPATH = ET.XPath("s:t | s:r/s:t", namespaces={"s": S_NS})
+
+
 class XlsxAdapter:
     suffixes = (".xlsx",)
 
@@ -24,35 +36,64 @@ class XlsxAdapter:
     ) -> ProcessStats:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        workbook = load_workbook(input_file)
         stats = ProcessStats()
+        roots: Dict[str, ET._Element] = {}
+
+        with zipfile.ZipFile(input_file, "r") as zin:
+            for name in zin.namelist():
+                if name == SHARED_STRINGS_PART:
+                    roots[name] = ET.fromstring(zin.read(name))
+                elif name.startswith("xl/worksheets/") and name.endswith(".xml"):
+                    xml_bytes = zin.read(name)
+                    # Only inline strings live in sheet XML; skip parsing sheets that have none.
+                    if b"inlineStr" in xml_bytes:
+                        roots[name] = ET.fromstring(xml_bytes)
+
+        items: List[ET._Element] = []
+        raw_texts: List[str] = []
+
+        for name, root in roots.items():
+            candidates = _SHARED_ITEM_XPATH(root) if name == SHARED_STRINGS_PART else _INLINE_ITEM_XPATH(root)
+            for item in candidates:
+                value = "".join(node.text or "" for node in _ITEM_TEXT_XPATH(item))
+                if value.startswith("="):
+                    continue
+                if not value.strip():
+                    continue
+                items.append(item)
+                raw_texts.append(value)
 
-        cells: List[Tuple[object, dict[str, str]]] = []
-        source_texts: List[str] = []
-
-        for sheet in workbook.worksheets:
-            for row in sheet.iter_rows():
-                for cell in row:
-                    value = cell.value
-                    if not isinstance(value, str):
-                        continue
-                    if value.startswith("="):
-                        continue
-                    if not value.strip():
-                        continue
-                    prepared, placeholders, lock_hits = glossary.preprocess_locks(value)
-                    cells.append((cell, placeholders))
-                    source_texts.append(prepared)
-                    stats.glossary_hits += lock_hits
-
-        translated = translator.translate(source_texts, progress_callback=progress_callback)
-        for index, translated_text in enumerate(translated):
-            restored, hits = glossary.postprocess(translated_text, cells[index][1])
-            cells[index][0].value = restored
-            stats.glossary_hits += hits
+        source_texts, placeholders_list, lock_hits = glossary.preprocess_locks_batch(raw_texts)
+        glossary_hits = sum(lock_hits)
 
+        if progress_callback and not source_texts:
+            progress_callback(0, 0)
+
+        translated = translate_deduplicated(translator, source_texts, progress_callback=progress_callback)
+        for item, translated_text, placeholders in zip(items, translated, placeholders_list):
+            restored, hits = glossary.postprocess(translated_text, placeholders)
+            _set_item_text(item, restored)
+            glossary_hits += hits
+
+        stats.glossary_hits += glossary_hits
         stats.segments_total = len(source_texts)
         stats.segments_translated = len(translated)
 
-        workbook.save(output_file)
+        part_payloads = {
+            name: XML_DECLARATION + ET.tostring(root, encoding="utf-8", xml_declaration=False)
+            for name, root in roots.items()
+        }
+        rewrite_zip(input_file, output_file, part_payloads)
         return stats
+
+
+def _set_item_text(item: ET._Element, text: str) -> None:
+    # Rich-text runs and phonetic hints are collapsed into one plain <t>, matching how
+    # openpyxl (rich_text=False) wrote translated cells back.
+    for child in list(item):
+        item.remove(child)
+    item.text = None
+    node = ET.SubElement(item, f"{{{S_NS}}}t")
+    node.text = text
+    if text != text.strip():
+        node.set(XML_SPACE, "preserve")
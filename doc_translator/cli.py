@@ -14,9 +14,9 @@ from doc_translator.config import read_lock
 from doc_translator.config import read_profiles
 from doc_translator.config import write_lock
 from doc_translator.glossary import Glossary
-from doc_translator.pipeline import TranslationPipeline
+from doc_translator.pipeline import TranslationPipeline, collect_supported_files
 from doc_translator.reporting import RunReport, build_logger
-from doc_translator.translator import TranslationConfig, create_translator
+from doc_translator.translator import CachingTranslator, TranslationConfig, create_translator
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -31,6 +31,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--batch-size", type=int, default=20, help="单次翻译批大小")
     parser.add_argument("--max-retries", type=int, default=3, help="失败重试次数")
     parser.add_argument("--rate-limit-rpm", type=int, default=60, help="每分钟请求数")
+    parser.add_argument("--max-parallel-files", type=int, default=4, help="同时处理的文件数")
     parser.add_argument("--provider", default="openai", help="模型提供商：openai 或 openai_compatible")
     parser.add_argument("--model", default="", help="模型名称，未传则从配置或环境变量读取")
     parser.add_argument("--base-url", default="", help="API Base URL（兼容接口场景必填）")
@@ -42,6 +43,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--compare-sample-size", type=int, default=80, help="模型对比采样段落数")
     parser.add_argument("--compare-report", default="compare_report.json", help="模型对比报告文件名")
     parser.add_argument("--force-run", action="store_true", help="忽略运行锁并强制执行")
+    parser.add_argument("--no-cache", action="store_true", help="禁用输出目录下的翻译缓存（.cache.db）")
     return parser
 
 
@@ -58,18 +60,7 @@ def main() -> None:
 
     try:
         glossary = Glossary.load(args.glossary)
-        files = TranslationPipeline(
-            translator=create_translator(
-                _make_config_from_args(
-                    args=args,
-                    local_config=local_config,
-                    provider_override=None,
-                    model_override=None,
-                    profile_overrides=None,
-                )
-            ),
-            glossary=glossary,
-        ).collect_files(args.input)
+        files = collect_supported_files(args.input)
         if not files:
             logger.warning("未找到可处理文件，请检查输入路径")
             return
@@ -97,13 +88,24 @@ def main() -> None:
             active_name, active_config = _single_profile(args=args, local_config=local_config)
 
         translator = create_translator(active_config)
-        pipeline = TranslationPipeline(translator=translator, glossary=glossary)
+        if not args.no_cache:
+            translator = CachingTranslator(translator, output_dir / ".cache.db", active_config)
+        pipeline = TranslationPipeline(
+            translator=translator,
+            glossary=glossary,
+            max_parallel_files=active_config.max_parallel_files,
+        )
         report = RunReport(
             source_lang=args.source,
             target_lang=args.target,
             model=f"{active_name}:{active_config.model}",
         )
-        pipeline.process_files(files, output_dir, suffix, report, logger)
+        try:
+            pipeline.process_files(pipeline.collect_files(files), output_dir, suffix, report, logger)
+        finally:
+            close = getattr(translator, "close", None)
+            if close:
+                close()
         report_file = output_dir / "report.json"
         report.write(report_file)
         logger.info("处理结束，报告已生成: %s", report_file)
@@ -230,6 +232,7 @@ def _make_config_from_args(
         batch_size=int(profile_overrides.get("batch_size", args.batch_size)),
         max_retries=int(profile_overrides.get("max_retries", args.max_retries)),
         rate_limit_rpm=int(profile_overrides.get("rate_limit_rpm", args.rate_limit_rpm)),
+        max_parallel_files=args.max_parallel_files,
     )
 
 
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 from pathlib import Path
 from typing import Any, Dict
 from typing import List
 
+from doc_translator.json_utils import json_loads
+
 
 def load_local_config(config_path: str | None) -> Dict[str, Any]:
     if not config_path:
@@ -14,7 +15,7 @@ def load_local_config(config_path: str | None) -> Dict[str, Any]:
     path = Path(config_path)
     if not path.exists():
         return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json_loads(path.read_bytes())
 
 
 def read_profiles(local_config: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -40,18 +41,23 @@ def is_pid_alive(pid: int) -> bool:
 
 def write_lock(lock_file: Path, owner: str) -> None:
     lock_file.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
-        "pid": os.getpid(),
-        "owner": owner,
-        "created_at": int(time.time()),
-    }
-    lock_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    lock_file.write_text(f"{os.getpid()}\n{owner}\n{int(time.time())}\n", encoding="utf-8")
 
 
 def read_lock(lock_file: Path) -> Dict[str, Any]:
     if not lock_file.exists():
         return {}
     try:
-        return json.loads(lock_file.read_text(encoding="utf-8"))
+        raw = lock_file.read_bytes()
+    except OSError:
+        return {}
+    parts = raw.decode("utf-8", errors="replace").splitlines()
+    if len(parts) >= 3:
+        try:
+            return {"pid": int(parts[0]), "owner": parts[1], "created_at": int(parts[2])}
+        except ValueError:
+            pass
+    try:
+        return json_loads(raw)
     except Exception:
         return {}
@@ -5,7 +5,15 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import ahocorasick
+except ModuleNotFoundError:
+    ahocorasick = None
+
+
+_LOCK_TOKEN_RE = re.compile(r"__LOCK_\d+__")
 
 
 @dataclass
@@ -29,6 +37,12 @@ class Glossary:
         self.terms: List[GlossaryTerm] = list(terms or [])
         self.lock_terms = [term for term in self.terms if term.lock]
         self.force_terms = [term for term in self.terms if not term.lock]
+        self._lock_pattern = _build_lock_pattern(self.lock_terms)
+        self._has_lock = self._lock_pattern is not None
+        self._force_pattern, self._force_targets = _build_force_pattern(self.force_terms)
+        self._force_automaton = _build_force_automaton(self.force_terms, case_sensitive=False)
+        self._force_automaton_cs = _build_force_automaton(self.force_terms, case_sensitive=True)
+        self._has_force = self._force_pattern is not None
 
     @staticmethod
     def load(path: str | Path | None) -> "Glossary":
@@ -43,43 +57,142 @@ class Glossary:
         return Glossary(_load_csv(file_path))
 
     def preprocess_locks(self, text: str) -> Tuple[str, Dict[str, str], int]:
+        if not self._has_lock:
+            return text, {}, 0
         placeholders: Dict[str, str] = {}
         hit_count = 0
-        updated = text
 
-        for index, term in enumerate(self.lock_terms):
-            placeholder = f"__LOCK_{index}__"
-            flags = 0 if term.case_sensitive else re.IGNORECASE
-            pattern = re.compile(re.escape(term.source), flags)
+        def repl(match: re.Match[str]) -> str:
+            nonlocal hit_count
+            hit_count += 1
+            key = f"__LOCK_{hit_count}__"
+            placeholders[key] = match.group(0)
+            return key
 
-            def repl(match: re.Match[str]) -> str:
-                nonlocal hit_count
-                hit_count += 1
-                key = f"{placeholder}_{hit_count}"
-                placeholders[key] = match.group(0)
-                return key
-
-            updated = pattern.sub(repl, updated)
+        updated = self._lock_pattern.sub(repl, text)
         return updated, placeholders, hit_count
 
+    def preprocess_locks_batch(self, texts: List[str]) -> Tuple[List[str], List[Dict[str, str]], List[int]]:
+        if not self._has_lock:
+            return list(texts), [{} for _ in texts], [0] * len(texts)
+        cache: Dict[str, Tuple[str, Dict[str, str], int]] = {}
+        prepared_texts: List[str] = []
+        placeholders_list: List[Dict[str, str]] = []
+        hit_counts: List[int] = []
+
+        for text in texts:
+            cached = cache.get(text)
+            if cached is None:
+                cached = self.preprocess_locks(text)
+                cache[text] = cached
+            prepared, placeholders, hits = cached
+            prepared_texts.append(prepared)
+            placeholders_list.append(dict(placeholders))
+            hit_counts.append(hits)
+        return prepared_texts, placeholders_list, hit_counts
+
     def postprocess(self, text: str, placeholders: Dict[str, str]) -> Tuple[str, int]:
+        if not placeholders and not self._has_force:
+            return text, 0
         updated = text
         hit_count = 0
 
-        for token, original in placeholders.items():
-            if token in updated:
-                updated = updated.replace(token, original)
+        if placeholders:
+            updated = _LOCK_TOKEN_RE.sub(lambda match: placeholders.get(match.group(0), match.group(0)), updated)
+
+        if self._force_automaton is not None or self._force_automaton_cs is not None:
+            replaced = self._replace_force_terms(updated)
+            if replaced is not None:
+                return replaced
 
-        for term in self.force_terms:
-            flags = 0 if term.case_sensitive else re.IGNORECASE
-            pattern = re.compile(re.escape(term.source), flags)
-            found = len(pattern.findall(updated))
-            if found:
-                hit_count += found
-                updated = pattern.sub(term.target, updated)
+        if not self._has_force:
+            return updated, hit_count
 
+        def repl(match: re.Match[str]) -> str:
+            nonlocal hit_count
+            hit_count += 1
+            return self._force_targets[match.lastindex - 1]
+
+        updated = self._force_pattern.sub(repl, updated)
         return updated, hit_count
 
+    def _replace_force_terms(self, text: str) -> Tuple[str, int] | None:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Offsets into the lowered text would not line up with the original.
+            return None
+
+        matches: List[Tuple[int, int, int, str]] = []
+        for automaton, haystack in ((self._force_automaton, lowered), (self._force_automaton_cs, text)):
+            if automaton is None:
+                continue
+            for end, (target, length, index) in automaton.iter(haystack):
+                matches.append((end - length + 1, end + 1, index, target))
+        if not matches:
+            return text, 0
+
+        # Leftmost match wins, longest first at the same start, then glossary order, as in the
+        # regex fallback; overlapping matches are dropped.
+        matches.sort(key=lambda item: (item[0], item[0] - item[1], item[2]))
+        pieces: List[str] = []
+        cursor = 0
+        hit_count = 0
+        for start, end, _index, target in matches:
+            if start < cursor:
+                continue
+            pieces.append(text[cursor:start])
+            pieces.append(target)
+            cursor = end
+            hit_count += 1
+        pieces.append(text[cursor:])
+        return "".join(pieces), hit_count
+
+
+def _build_lock_pattern(lock_terms: List[GlossaryTerm]) -> re.Pattern[str] | None:
+    sources = [term for term in lock_terms if term.source]
+    if not sources:
+        return None
+    # Alternation is ordered, so longer terms go first to win overlapping matches.
+    sources.sort(key=lambda term: len(term.source), reverse=True)
+    alternatives = [
+        re.escape(term.source) if term.case_sensitive else f"(?i:{re.escape(term.source)})"
+        for term in sources
+    ]
+    return re.compile("|".join(alternatives))
+
+
+def _build_force_pattern(force_terms: List[GlossaryTerm]) -> Tuple[re.Pattern[str] | None, List[str]]:
+    selected: Dict[Tuple[bool, str], GlossaryTerm] = {}
+    for term in force_terms:
+        if term.source:
+            key = term.source if term.case_sensitive else term.source.lower()
+            selected.setdefault((term.case_sensitive, key), term)
+    if not selected:
+        return None, []
+    # Same leftmost-longest order as the lock pattern; group N maps to targets[N - 1].
+    ordered = sorted(selected.values(), key=lambda term: len(term.source), reverse=True)
+    alternatives = [
+        f"({re.escape(term.source)})" if term.case_sensitive else f"(?i:({re.escape(term.source)}))"
+        for term in ordered
+    ]
+    return re.compile("|".join(alternatives)), [term.target for term in ordered]
+
+
+def _build_force_automaton(force_terms: List[GlossaryTerm], case_sensitive: bool) -> Any:
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, term in enumerate(force_terms):
+        if not term.source or term.case_sensitive != case_sensitive:
+            continue
+        key = term.source if case_sensitive else term.source.lower()
+        if not automaton.exists(key):
+            automaton.add_word(key, (term.target, len(key), index))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
 
 def _load_csv(path: Path) -> List[GlossaryTerm]:
     terms: List[GlossaryTerm] = []
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Iterable, List
+import threading
+from typing import Dict, Iterable, List, Tuple
 
 from doc_translator.adapters.base import FileAdapter
 from doc_translator.glossary import Glossary
@@ -10,15 +13,37 @@ from doc_translator.reporting import FileResult, RunReport
 from doc_translator.translator import TranslatorProtocol
 
 
-SUPPORTED_SUFFIXES = {".docx", ".xlsx", ".pdf"}
+SUPPORTED_SUFFIXES = frozenset({".docx", ".xlsx", ".pdf"})
+# Case-insensitive glob per suffix, e.g. "*.[dD][oO][cC][xX]".
+_SUFFIX_GLOBS = tuple(
+    "*." + "".join(f"[{char}{char.upper()}]" for char in suffix.lstrip("."))
+    for suffix in sorted(SUPPORTED_SUFFIXES)
+)
+
+
+def collect_supported_files(inputs: Iterable[str | Path]) -> List[Path]:
+    files: set[Path] = set()
+    for raw in inputs:
+        path = Path(raw)
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
+            files.add(path)
+            continue
+        if path.is_dir():
+            files.update(
+                child
+                for child in chain.from_iterable(path.rglob(pattern) for pattern in _SUFFIX_GLOBS)
+                if child.is_file()
+            )
+    return sorted(files)
 
 
 class TranslationPipeline:
-    def __init__(self, translator: TranslatorProtocol, glossary: Glossary):
+    def __init__(self, translator: TranslatorProtocol, glossary: Glossary, max_parallel_files: int = 1):
         from doc_translator.adapters.docx_adapter import DocxAdapter
 
         self.translator = translator
         self.glossary = glossary
+        self.max_parallel_files = max(1, max_parallel_files)
         self.adapters: Dict[str, FileAdapter] = {}
 
         adapter_instances = [DocxAdapter()]
@@ -40,19 +65,14 @@ class TranslationPipeline:
             for suffix in adapter.suffixes:
                 self.adapters[suffix] = adapter
 
-    def collect_files(self, inputs: Iterable[str]) -> List[Path]:
-        files: List[Path] = []
-        for raw in inputs:
-            path = Path(raw)
-            if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
-                files.append(path)
-                continue
-            if path.is_dir():
-                for child in path.rglob("*"):
-                    if child.is_file() and child.suffix.lower() in SUPPORTED_SUFFIXES:
-                        files.append(child)
-        dedup = sorted(set(files))
-        return dedup
+    def collect_files(self, inputs: Iterable[str | Path]) -> List[Tuple[Path, FileAdapter]]:
+        # Adapters are resolved once here; suffixes without a loaded adapter are dropped.
+        files: List[Tuple[Path, FileAdapter]] = []
+        for path in collect_supported_files(inputs):
+            adapter = self.adapters.get(path.suffix.lower())
+            if adapter:
+                files.append((path, adapter))
+        return files
 
     def make_output_path(self, input_file: Path, output_dir: Path, suffix: str) -> Path:
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -61,7 +81,7 @@ class TranslationPipeline:
 
     def process_files(
         self,
-        files: List[Path],
+        files: List[Tuple[Path, FileAdapter]],
         output_dir: Path,
         suffix: str,
         report: RunReport,
@@ -69,12 +89,11 @@ class TranslationPipeline:
         file_progress_callback: Callable[[Path, int, int, int], None] | None = None,
         file_finished_callback: Callable[[Path, str], None] | None = None,
     ) -> None:
-        for input_file in files:
-            adapter = self.adapters.get(input_file.suffix.lower())
+        # Files run on worker threads; report updates and caller callbacks are serialized.
+        report_lock = threading.Lock()
+
+        def process_one(input_file: Path, adapter: FileAdapter) -> None:
             output_file = self.make_output_path(input_file, output_dir, suffix)
-            if not adapter:
-                logger.warning("跳过不支持的文件类型: %s", input_file)
-                continue
             try:
                 logger.info("开始处理: %s", input_file)
                 last_logged_percent = -1
@@ -88,7 +107,8 @@ class TranslationPipeline:
                         last_logged_percent = percent
                         logger.info("翻译进度: %s | %d/%d (%d%%)", input_file.name, done, total, percent)
                     if file_progress_callback:
-                        file_progress_callback(input_file, done, total, percent)
+                        with report_lock:
+                            file_progress_callback(input_file, done, total, percent)
 
                 stats = adapter.process(
                     input_file,
@@ -97,28 +117,51 @@ class TranslationPipeline:
                     self.glossary,
                     progress_callback=on_progress,
                 )
-                report.add_result(
-                    FileResult(
-                        input_path=str(input_file),
-                        output_path=str(output_file),
-                        status="success",
-                        segments_total=stats.segments_total,
-                        segments_translated=stats.segments_translated,
-                        glossary_hits=stats.glossary_hits,
+                with report_lock:
+                    report.add_result(
+                        FileResult(
+                            input_path=str(input_file),
+                            output_path=str(output_file),
+                            status="success",
+                            segments_total=stats.segments_total,
+                            segments_translated=stats.segments_translated,
+                            glossary_hits=stats.glossary_hits,
+                        )
                     )
-                )
-                logger.info("完成处理: %s -> %s", input_file, output_file)
-                if file_finished_callback:
-                    file_finished_callback(input_file, "success")
+                    logger.info("完成处理: %s -> %s", input_file, output_file)
+                    if file_finished_callback:
+                        file_finished_callback(input_file, "success")
             except Exception as exc:
-                report.add_result(
-                    FileResult(
-                        input_path=str(input_file),
-                        output_path=str(output_file),
-                        status="failed",
-                        error=str(exc),
+                with report_lock:
+                    report.add_result(
+                        FileResult(
+                            input_path=str(input_file),
+                            output_path=str(output_file),
+                            status="failed",
+                            error=str(exc),
+                        )
                     )
-                )
-                logger.exception("处理失败: %s", input_file)
-                if file_finished_callback:
-                    file_finished_callback(input_file, "failed")
+                    logger.exception("处理失败: %s", input_file)
+                    if file_finished_callback:
+                        file_finished_callback(input_file, "failed")
+
+        if self.max_parallel_files == 1 or len(files) <= 1:
+            for input_file, adapter in files:
+                process_one(input_file, adapter)
+            return
+
+        # Inputs with the same name in different directories map to the same output file; those run one
+        # after another in input order (as in a sequential run), everything else in parallel.
+        groups: Dict[str, List[Tuple[Path, FileAdapter]]] = {}
+        for input_file, adapter in files:
+            output_key = str(self.make_output_path(input_file, output_dir, suffix)).lower()
+            groups.setdefault(output_key, []).append((input_file, adapter))
+
+        def process_group(group: List[Tuple[Path, FileAdapter]]) -> None:
+            for input_file, adapter in group:
+                process_one(input_file, adapter)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel_files, len(groups))) as executor:
+            futures = [executor.submit(process_group, group) for group in groups.values()]
+            for future in as_completed(futures):
+                future.result()
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-import json
+import atexit
 import logging
-from dataclasses import asdict, dataclass, field
+import queue
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import List
 
+from doc_translator.json_utils import json_dumps
+
+
+_listener: QueueListener | None = None
+
 
 def build_logger(log_file: Path) -> logging.Logger:
-    log_file.parent.mkdir(parents=True, exist_ok=True)
+    global _listener
     logger = logging.getLogger("doc_translator")
+    if logger.handlers and getattr(logger, "_log_file", None) == log_file:
+        return logger
+
+    log_file.parent.mkdir(parents=True, exist_ok=True)
     logger.setLevel(logging.INFO)
+    _stop_listener()
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers.clear()
 
     formatter = logging.Formatter(
@@ -20,14 +34,32 @@ def build_logger(log_file: Path) -> logging.Logger:
 
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+
+    # Translation threads only enqueue records; the listener thread does the file/console I/O.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, stream_handler)
+    _listener.start()
+    logger._log_file = log_file  # type: ignore[attr-defined]
     return logger
 
 
+def _stop_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 @dataclass
 class FileResult:
     input_path: str
@@ -65,7 +97,8 @@ class RunReport:
 
     def write(self, output_file: Path) -> None:
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        payload = asdict(self)
+        # FileResult only holds scalars, so a shallow copy serializes the same as asdict().
+        payload = {**self.__dict__, "results": [result.__dict__ for result in self.results]}
         temp_file = output_file.with_suffix(output_file.suffix + ".tmp")
-        temp_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        temp_file.write_bytes(json_dumps(payload, indent=True))
         temp_file.replace(output_file)
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import json
 import os
+import random
 import re
+import sqlite3
+import threading
 import time
-import urllib.error
-import urllib.request
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Callable
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Protocol
 
+from doc_translator.json_utils import json_dumps
+from doc_translator.json_utils import json_loads
+
+
+MAX_BATCH_WORKERS = 8
+TRANSLATION_MEMO_SIZE = 4096
+RETRY_BASE_DELAY = 1.2
+RETRY_MAX_DELAY = 30.0
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
 
 @dataclass
 class TranslationConfig:
@@ -27,6 +44,7 @@ class TranslationConfig:
     batch_size: int = 20
     max_retries: int = 3
     rate_limit_rpm: int = 60
+    max_parallel_files: int = 4
     model: str = "gpt-4.1-mini"
     temperature: float = 0.0
     timeout_seconds: int = 120
@@ -48,12 +66,19 @@ class BaseBatchTranslator(ABC):
         self.config.model = _resolve_model(config.model)
         self.request_interval = 60.0 / max(1, config.rate_limit_rpm)
         self.last_request_at = 0.0
+        self._rate_lock = threading.Lock()
+        # Set to 0 to disable the in-process memo, e.g. when a TTL cache already sits in front.
+        self.memo_size = TRANSLATION_MEMO_SIZE
+        self._memo: OrderedDict[str, str] = OrderedDict()
+        self._memo_lock = threading.Lock()
 
     def _sleep_if_needed(self) -> None:
-        now = time.time()
-        elapsed = now - self.last_request_at
-        if elapsed < self.request_interval:
-            time.sleep(self.request_interval - elapsed)
+        with self._rate_lock:
+            now = time.time()
+            wait = self.last_request_at + self.request_interval - now
+            self.last_request_at = now + max(0.0, wait)
+        if wait > 0:
+            time.sleep(wait)
 
     @staticmethod
     def _build_prompt(source_lang: str, target_lang: str, domain: str) -> str:
@@ -79,36 +104,107 @@ class BaseBatchTranslator(ABC):
         if not texts:
             return []
 
-        output: List[str] = []
-        translated_count = 0
+        total = len(texts)
+        slots: Dict[str, int] = {}
+        inverse = [slots.setdefault(text, len(slots)) for text in texts]
+        unique_texts = list(slots)
+        unique_output = list(unique_texts)
+        pending: List[int] = []
+        use_memo = self.memo_size > 0
+        # Identical segments are sent once; segments seen in earlier calls come from the memo.
+        with self._memo_lock:
+            for index, text in enumerate(unique_texts):
+                if not text.strip():
+                    continue
+                cached = self._memo.get(text) if use_memo else None
+                if cached is None:
+                    pending.append(index)
+                else:
+                    self._memo.move_to_end(text)
+                    unique_output[index] = cached
+
+        if pending:
+            resolved = len(unique_texts) - len(pending)
+            translated = self._translate_batches(
+                [unique_texts[index] for index in pending],
+                progress_callback=(
+                    (lambda done, _total: progress_callback((resolved + done) * total // len(unique_texts), total))
+                    if progress_callback
+                    else None
+                ),
+            )
+            with self._memo_lock:
+                for index, translated_text in zip(pending, translated):
+                    unique_output[index] = translated_text
+                    if use_memo:
+                        self._memo[unique_texts[index]] = translated_text
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        elif progress_callback:
+            progress_callback(total, total)
+
+        return [unique_output[index] for index in inverse]
+
+    def _translate_batches(
+        self,
+        texts: List[str],
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> List[str]:
         total = len(texts)
         size = max(1, self.config.batch_size)
-        for start in range(0, len(texts), size):
-            batch = texts[start : start + size]
-            try:
-                translated_batch = self.translate_batch(batch)
-                output.extend(translated_batch)
-                translated_count += len(translated_batch)
+        batches = [texts[start : start + size] for start in range(0, total, size)]
+        results: List[List[str]] = [[] for _ in batches]
+        translated_count = 0
+        progress_lock = threading.Lock()
+
+        def advance(count: int) -> None:
+            nonlocal translated_count
+            with progress_lock:
+                translated_count += count
                 if progress_callback:
                     progress_callback(translated_count, total)
+
+        def run_batch(index: int) -> None:
+            batch = batches[index]
+            try:
+                translated_batch = self.translate_batch(batch)
+                results[index] = translated_batch
+                advance(len(translated_batch))
             except Exception:
+                translated_items: List[str] = []
                 for item in batch:
                     translated_item = self.translate_batch([item])
-                    output.extend(translated_item)
-                    translated_count += len(translated_item)
-                    if progress_callback:
-                        progress_callback(translated_count, total)
-        return output
+                    translated_items.extend(translated_item)
+                    advance(len(translated_item))
+                results[index] = translated_items
+
+        if len(batches) == 1:
+            run_batch(0)
+        else:
+            # Requests still go through _sleep_if_needed, so the RPM limit holds across threads.
+            with ThreadPoolExecutor(max_workers=min(len(batches), MAX_BATCH_WORKERS)) as executor:
+                futures = [executor.submit(run_batch, index) for index in range(len(batches))]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+
+        return [item for batch in results for item in batch]
 
 
 class OpenAITranslator(BaseBatchTranslator):
     def __init__(self, config: TranslationConfig):
         super().__init__(config)
         try:
-            from openai import OpenAI
+            from openai import APIStatusError, OpenAI
         except ModuleNotFoundError as exc:
             raise RuntimeError("缺少依赖 openai，请先执行: pip install -r requirements.txt") from exc
 
+        self._status_error = APIStatusError
+
         if self.config.base_url:
             self.client: Any = OpenAI(api_key=self.config.api_key, base_url=self.config.base_url)
         else:
@@ -121,11 +217,11 @@ class OpenAITranslator(BaseBatchTranslator):
         self._sleep_if_needed()
         prompt = self._build_prompt(self.config.source_lang, self.config.target_lang, self.config.domain)
 
-        message = json.dumps(texts, ensure_ascii=False)
+        message = json_dumps(texts).decode("utf-8")
         retries = self.config.max_retries
         last_error = ""
 
-        for _ in range(retries):
+        for attempt in range(retries):
             try:
                 response = self.client.chat.completions.create(
                     model=self.config.model,
@@ -135,13 +231,15 @@ class OpenAITranslator(BaseBatchTranslator):
                         {"role": "user", "content": message},
                     ],
                 )
-                self.last_request_at = time.time()
                 content = _extract_openai_chat_content(response)
                 translated = _parse_translated_content(content, len(texts))
                 return [str(item) for item in translated]
             except Exception as exc:
+                if isinstance(exc, self._status_error) and not _is_retryable_status(exc.status_code):
+                    raise RuntimeError(f"翻译请求失败: {exc}") from exc
                 last_error = str(exc)
-                time.sleep(1.2)
+                if attempt + 1 < retries:
+                    time.sleep(_retry_delay(attempt))
 
         raise RuntimeError(f"翻译请求失败: {last_error}")
 
@@ -152,6 +250,23 @@ class OpenAICompatibleTranslator(BaseBatchTranslator):
         if not self.config.base_url:
             raise RuntimeError("使用 openai_compatible 提供商时，需要配置 base_url")
         self.api_url = _build_api_url(self.config.base_url, self.config.endpoint)
+        try:
+            import httpx
+        except ModuleNotFoundError as exc:
+            raise RuntimeError("缺少依赖 httpx，请先执行: pip install -r requirements.txt") from exc
+
+        self._http_error = httpx.HTTPError
+        self._status_error = httpx.HTTPStatusError
+        # Keep-alive connections are reused across batches; HTTP/2 needs the optional h2 package.
+        self._client = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=self.config.timeout_seconds,
+            headers={
+                "Authorization": f"Bearer {self.config.api_key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
 
     def translate_batch(self, texts: List[str]) -> List[str]:
         if not texts:
@@ -164,38 +279,110 @@ class OpenAICompatibleTranslator(BaseBatchTranslator):
             "temperature": self.config.temperature,
             "messages": [
                 {"role": "system", "content": prompt},
-                {"role": "user", "content": json.dumps(texts, ensure_ascii=False)},
+                {"role": "user", "content": json_dumps(texts).decode("utf-8")},
             ],
         }
 
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        data = json_dumps(payload)
         retries = self.config.max_retries
         last_error = ""
 
-        for _ in range(retries):
-            request = urllib.request.Request(
-                self.api_url,
-                data=data,
-                method="POST",
-                headers={
-                    "Authorization": f"Bearer {self.config.api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
+        for attempt in range(retries):
             try:
-                with urllib.request.urlopen(request, timeout=self.config.timeout_seconds) as response:
-                    body = response.read().decode("utf-8")
-                self.last_request_at = time.time()
-                raw = json.loads(body)
+                response = self._client.post(self.api_url, content=data)
+                response.raise_for_status()
+                raw = json_loads(response.content)
                 content = raw["choices"][0]["message"]["content"]
                 translated = _parse_translated_content(content, len(texts))
                 return [str(item) for item in translated]
-            except (urllib.error.URLError, KeyError, ValueError, json.JSONDecodeError) as exc:
+            except (self._http_error, KeyError, ValueError) as exc:
+                if isinstance(exc, self._status_error) and not _is_retryable_status(exc.response.status_code):
+                    raise RuntimeError(f"翻译请求失败: {exc}") from exc
                 last_error = str(exc)
-                time.sleep(1.2)
+                if attempt + 1 < retries:
+                    time.sleep(_retry_delay(attempt))
 
         raise RuntimeError(f"翻译请求失败: {last_error}")
 
+    def close(self) -> None:
+        self._client.close()
+
+
+class CachingTranslator:
+    _LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(self, translator: TranslatorProtocol, cache_file: Path, config: TranslationConfig):
+        self.translator = translator
+        self._key_prefix = f"{config.provider}|{config.model}|{config.source_lang}|{config.target_lang}|{config.domain}|"
+        self._lock = threading.Lock()
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_file), isolation_level=None, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS t(k BLOB PRIMARY KEY, v TEXT) WITHOUT ROWID")
+
+    def translate(
+        self,
+        texts: List[str],
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> List[str]:
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+        cached = self._lookup(keys)
+        output = [cached.get(key, "") for key in keys]
+        missing = [index for index, key in enumerate(keys) if key not in cached]
+
+        total = len(texts)
+        hit_count = total - len(missing)
+        if progress_callback and hit_count:
+            progress_callback(hit_count, total)
+        if not missing:
+            return output
+
+        translated = self.translator.translate(
+            [texts[index] for index in missing],
+            progress_callback=(
+                (lambda done, _total: progress_callback(hit_count + done, total))
+                if progress_callback
+                else None
+            ),
+        )
+        for index, translated_text in zip(missing, translated):
+            output[index] = translated_text
+        self._store([(keys[index], output[index]) for index in missing])
+        return output
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        close = getattr(self.translator, "close", None)
+        if close:
+            close()
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self._key_prefix}{text}".encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, keys: List[bytes]) -> dict[bytes, str]:
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[bytes, str] = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), self._LOOKUP_CHUNK_SIZE):
+                chunk = unique_keys[start : start + self._LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT k, v FROM t WHERE k IN ({placeholders})", chunk)
+                found.update(rows)
+        return found
+
+    def _store(self, rows: List[tuple[bytes, str]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO t(k, v) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
 
 def create_translator(config: TranslationConfig) -> TranslatorProtocol:
     provider = (config.provider or "openai").strip().lower()
@@ -206,6 +393,15 @@ def create_translator(config: TranslationConfig) -> TranslatorProtocol:
     raise RuntimeError(f"不支持的 provider: {config.provider}")
 
 
+def _is_retryable_status(status_code: int) -> bool:
+    # Other 4xx responses (bad request, auth, not found) will not succeed on retry.
+    return status_code == 429 or not 400 <= status_code < 500
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(RETRY_BASE_DELAY * 2**attempt + random.uniform(0, 0.3), RETRY_MAX_DELAY)
+
+
 def _resolve_api_key(config_key: str) -> str:
     api_key = config_key or os.getenv("OPEN_API_KEY") or os.getenv("OPENAI_API_KEY") or os.getenv("LLM_API_KEY")
     if not api_key:
@@ -237,14 +433,18 @@ def _parse_translated_content(content: str, expected_len: int) -> List[str]:
         raise ValueError("上游返回了 HTML 页面，请检查 provider/base_url/endpoint 配置")
 
     candidates = [text]
-    code_block_match = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE)
-    if code_block_match:
-        candidates.insert(0, code_block_match.group(1).strip())
+    # Bare JSON is the common reply; only look for a fenced block otherwise.
+    if text[0] not in "[{":
+        code_block_match = _CODE_BLOCK_RE.search(text)
+        if code_block_match:
+            candidates.insert(0, code_block_match.group(1).strip())
 
     for candidate in candidates:
+        if not _looks_like_json(candidate):
+            continue
         try:
-            parsed = json.loads(candidate)
-        except json.JSONDecodeError:
+            parsed = json_loads(candidate)
+        except ValueError:
             continue
 
         if isinstance(parsed, list):
@@ -269,6 +469,11 @@ def _parse_translated_content(content: str, expected_len: int) -> List[str]:
     raise ValueError("翻译返回长度与输入不一致")
 
 
+def _looks_like_json(text: str) -> bool:
+    text = text.lstrip()
+    return bool(text) and text[0] in "[{\""
+
+
 def _extract_openai_chat_content(response: Any) -> str:
     if response is None:
         return "[]"
@@ -308,6 +513,8 @@ def _extract_openai_chat_content(response: Any) -> str:
         lowered = candidate.lower()
         if "<!doctype html" in lowered or "<html" in lowered:
             raise RuntimeError("上游返回了 HTML 页面，请检查 provider/base_url/endpoint 配置")
+        if not _looks_like_json(candidate):
+            return candidate
         try:
             parsed = json.loads(candidate)
             return _extract_openai_chat_content(parsed)
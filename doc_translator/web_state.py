@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
 import time
 from pathlib import Path
 from typing import Any
 from typing import Dict
 
+from doc_translator.json_utils import json_dumps
+from doc_translator.json_utils import json_loads
+
+
+STATE_FLUSH_INTERVAL = 0.25
+_FLUSH_KEYS = frozenset({"status", "completed_files"})
+
 
 def make_initial_state(job_id: str, output_dir: Path, log_path: Path) -> Dict[str, Any]:
     now = time.time()
@@ -15,7 +23,7 @@ def make_initial_state(job_id: str, output_dir: Path, log_path: Path) -> Dict[st
         "message": "任务已创建，等待执行",
         "created_at": now,
         "updated_at": now,
-        "current_file": "",
+        "current_file": [],
         "file_done": 0,
         "file_total": 0,
         "file_percent": 0,
@@ -34,16 +42,19 @@ def read_state(state_file: Path) -> Dict[str, Any]:
     if not state_file.exists():
         return {}
     try:
-        return json.loads(state_file.read_text(encoding="utf-8"))
+        return json_loads(state_file.read_bytes())
     except Exception:
         return {}
 
 
-def write_state(state_file: Path, payload: Dict[str, Any]) -> None:
-    state_file.parent.mkdir(parents=True, exist_ok=True)
+def write_state(state_file: Path, payload: Dict[str, Any], make_parent: bool = True) -> None:
+    if make_parent:
+        state_file.parent.mkdir(parents=True, exist_ok=True)
     tmp_file = state_file.with_suffix(".tmp")
-    tmp_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp_file.replace(state_file)
+    # State is rewritten on every progress tick, so it is kept compact.
+    with open(tmp_file, "wb") as file:
+        file.write(json_dumps(payload))
+    os.replace(tmp_file, state_file)
 
 
 def patch_state(state_file: Path, **updates: Any) -> Dict[str, Any]:
@@ -52,3 +63,63 @@ def patch_state(state_file: Path, **updates: Any) -> Dict[str, Any]:
     payload["updated_at"] = time.time()
     write_state(state_file, payload)
     return payload
+
+
+class StateWriter:
+    def __init__(self, state_file: Path, min_interval: float = STATE_FLUSH_INTERVAL):
+        self.state_file = state_file
+        self.min_interval = min_interval
+        self.payload = read_state(state_file)
+        self._dirty = False
+        self._last_flush = 0.0
+        self._parent_ready = False
+        self._cond = threading.Condition()
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+
+    def update(self, **updates: Any) -> Dict[str, Any]:
+        with self._cond:
+            self.payload.update(updates)
+            self.payload["updated_at"] = time.time()
+            self._dirty = True
+            if not _FLUSH_KEYS.isdisjoint(updates) or time.monotonic() - self._last_flush >= self.min_interval:
+                self._write()
+            elif not self._closed:
+                # Throttled updates are written by one flusher thread once the interval has passed.
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run_flusher, name="state-flusher", daemon=True)
+                    self._flusher.start()
+                self._cond.notify()
+            return self.payload
+
+    def flush(self) -> None:
+        with self._cond:
+            self._write()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._write()
+            self._cond.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def _write(self) -> None:
+        if not self._dirty:
+            return
+        write_state(self.state_file, self.payload, make_parent=not self._parent_ready)
+        self._parent_ready = True
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _run_flusher(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if not self._dirty:
+                    self._cond.wait()
+                    continue
+                delay = self._last_flush + self.min_interval - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                self._write()
@@ -7,15 +7,13 @@ import traceback
 from pathlib import Path
 
 from doc_translator.glossary import Glossary
-from doc_translator.pipeline import SUPPORTED_SUFFIXES
+from doc_translator.pipeline import collect_supported_files
 from doc_translator.pipeline import TranslationPipeline
 from doc_translator.reporting import RunReport
 from doc_translator.reporting import build_logger
 from doc_translator.translator import TranslationConfig
 from doc_translator.translator import create_translator
-from doc_translator.web_state import patch_state
-from doc_translator.web_state import read_state
-from doc_translator.web_state import write_state
+from doc_translator.web_state import StateWriter
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -27,8 +25,15 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     args = build_parser().parse_args()
-    jobs_root = Path(args.jobs_root)
-    job_id = args.job_id
+    run_job(Path(args.jobs_root), args.job_id)
+
+
+def prewarm() -> int:
+    # Submitted to pool processes at web app start so the import graph is loaded before the first job.
+    return os.getpid()
+
+
+def run_job(jobs_root: Path, job_id: str) -> None:
     job_dir = jobs_root / job_id
     state_file = job_dir / "job_state.json"
     input_dir = job_dir / "input"
@@ -36,12 +41,11 @@ def main() -> None:
     log_file = output_dir / "logs" / "translator.log"
     logger = build_logger(log_file)
 
-    state = read_state(state_file)
-    if not state:
+    state = StateWriter(state_file)
+    if not state.payload:
         raise RuntimeError(f"任务状态不存在: {state_file}")
 
-    patch_state(
-        state_file,
+    state.update(
         status="running",
         message="任务运行中",
         pid=os.getpid(),
@@ -49,9 +53,10 @@ def main() -> None:
     )
 
     config_payload = json.loads((job_dir / "job_config.json").read_text(encoding="utf-8"))
+    translator = None
 
     try:
-        files = sorted([file for file in input_dir.rglob("*") if file.is_file() and file.suffix.lower() in SUPPORTED_SUFFIXES])
+        files = collect_supported_files([input_dir])
         if not files:
             report = RunReport(
                 source_lang=str(config_payload["source"]),
@@ -60,8 +65,7 @@ def main() -> None:
             )
             report_file = output_dir / "report.json"
             report.write(report_file)
-            patch_state(
-                state_file,
+            state.update(
                 status="completed",
                 message="未检测到受支持文件，任务已完成",
                 overall_percent=100,
@@ -83,13 +87,24 @@ def main() -> None:
             batch_size=int(config_payload["batch_size"]),
             max_retries=int(config_payload["max_retries"]),
             rate_limit_rpm=int(config_payload["rate_limit_rpm"]),
+            max_parallel_files=int(config_payload.get("max_parallel_files", 4)),
         )
         translator = create_translator(config)
         glossary = Glossary.load(None)
-        pipeline = TranslationPipeline(translator=translator, glossary=glossary)
-        files = pipeline.collect_files([str(input_dir)])
+        pipeline = TranslationPipeline(
+            translator=translator,
+            glossary=glossary,
+            max_parallel_files=config.max_parallel_files,
+        )
 
-        patch_state(state_file, total_files=len(files))
+        jobs = pipeline.collect_files(files)
+        total_files = max(1, len(jobs))
+        completed_files = 0
+        # Files run in parallel, so progress is tracked per file: fraction done, and (done, total) for files
+        # still in flight. The pipeline invokes both callbacks under its report lock.
+        file_fractions: dict[Path, float] = {}
+        active_files: dict[Path, tuple[int, int]] = {}
+        state.update(total_files=len(jobs))
 
         report = RunReport(
             source_lang=config.source_lang,
@@ -97,33 +112,32 @@ def main() -> None:
             model=config.model,
         )
 
-        def on_file_progress(file_path: Path, done: int, total: int, percent: int) -> None:
-            state = read_state(state_file)
-            completed_files = int(state.get("completed_files", 0) or 0)
-            total_files = max(1, int(state.get("total_files", 0) or 0))
-            overall_percent = int(((completed_files + percent / 100.0) / total_files) * 100)
-            patch_state(
-                state_file,
-                current_file=file_path.name,
-                file_done=done,
-                file_total=total,
-                file_percent=percent,
-                overall_percent=overall_percent,
+        def publish_progress(**updates: object) -> None:
+            active_done = sum(done for done, _total in active_files.values())
+            active_total = sum(total for _done, total in active_files.values())
+            state.update(
+                current_file=[path.name for path in active_files],
+                file_done=active_done,
+                file_total=active_total,
+                file_percent=int(active_done * 100 / active_total) if active_total else 0,
+                overall_percent=min(100, int(sum(file_fractions.values()) / total_files * 100)),
+                **updates,
             )
 
-        def on_file_finished(_file_path: Path, _status: str) -> None:
-            state = read_state(state_file)
-            completed_files = int(state.get("completed_files", 0) or 0) + 1
-            total_files = max(1, int(state.get("total_files", 0) or 0))
-            overall_percent = int((completed_files / total_files) * 100)
-            patch_state(
-                state_file,
-                completed_files=completed_files,
-                overall_percent=overall_percent,
-            )
+        def on_file_progress(file_path: Path, done: int, total: int, percent: int) -> None:
+            file_fractions[file_path] = percent / 100.0
+            active_files[file_path] = (done, total)
+            publish_progress()
+
+        def on_file_finished(file_path: Path, _status: str) -> None:
+            nonlocal completed_files
+            completed_files += 1
+            file_fractions[file_path] = 1.0
+            active_files.pop(file_path, None)
+            publish_progress(completed_files=completed_files)
 
         pipeline.process_files(
-            files=files,
+            files=jobs,
             output_dir=output_dir,
             suffix=str(config_payload["suffix"]),
             report=report,
@@ -134,22 +148,25 @@ def main() -> None:
 
         report_file = output_dir / "report.json"
         report.write(report_file)
-        patch_state(
-            state_file,
+        state.update(
             status="completed",
             message="任务完成",
             overall_percent=100,
             report_path=str(report_file),
         )
     except Exception as exc:
-        patch_state(
-            state_file,
+        state.update(
             status="failed",
             message="任务失败",
             error=str(exc),
             traceback=traceback.format_exc(),
         )
         logger.exception("任务失败: %s", job_id)
+    finally:
+        close = getattr(translator, "close", None)
+        if close:
+            close()
+        state.close()
 
 
 if __name__ == "__main__":
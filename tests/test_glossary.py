@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from doc_translator.glossary import Glossary
+from doc_translator.glossary import GlossaryTerm
+from doc_translator.glossary import ahocorasick
+
+
+def _regex_postprocess(glossary: Glossary, text: str) -> tuple[str, int]:
+    automata = glossary._force_automaton, glossary._force_automaton_cs
+    glossary._force_automaton = glossary._force_automaton_cs = None
+    try:
+        return glossary.postprocess(text, {})
+    finally:
+        glossary._force_automaton, glossary._force_automaton_cs = automata
+
+
+@unittest.skipIf(ahocorasick is None, "pyahocorasick 未安装")
+class ForceTermPathsTest(unittest.TestCase):
+    def assert_paths_agree(self, glossary: Glossary, text: str) -> None:
+        self.assertIsNotNone(glossary._replace_force_terms(text))
+        self.assertEqual(glossary.postprocess(text, {}), _regex_postprocess(glossary, text))
+
+    def test_same_span_tie_follows_glossary_order(self) -> None:
+        for first_cs in (False, True):
+            glossary = Glossary(
+                [
+                    GlossaryTerm("Term", "first", case_sensitive=first_cs),
+                    GlossaryTerm("Term", "second", case_sensitive=not first_cs),
+                ]
+            )
+            self.assertEqual(glossary.postprocess("a Term b", {}), ("a first b", 1))
+            self.assert_paths_agree(glossary, "a Term b term TERM")
+
+    def test_randomized_glossaries_match_regex_fallback(self) -> None:
+        rng = random.Random(20240601)
+        alphabet = "abAB "
+        for _ in range(3000):
+            terms = [
+                GlossaryTerm(
+                    source="".join(rng.choice("abAB") for _ in range(rng.randint(1, 3))),
+                    target=f"<{index}>",
+                    case_sensitive=rng.random() < 0.5,
+                )
+                for index in range(rng.randint(1, 6))
+            ]
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            self.assert_paths_agree(Glossary(terms), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
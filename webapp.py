@@ -1,25 +1,55 @@
 from __future__ import annotations
 
-import json
+import contextlib
+import functools
+import hashlib
+import io
+import multiprocessing
 import os
+import shutil
 import subprocess
 import sys
+import tarfile
+import tempfile
+import threading
+import time
 import uuid
 import zipfile
+import zlib
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple
 from pathlib import Path
 from typing import Any
+from typing import BinaryIO
+from typing import Iterator
 
 from flask import Flask
-from flask import jsonify
+from flask import Response
 from flask import make_response
 from flask import render_template
 from flask import request
 from flask import send_file
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 
+try:
+    from streaming_form_data import StreamingFormDataParser
+except ModuleNotFoundError:
+    StreamingFormDataParser = None
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+
 from doc_translator.config import is_pid_alive
 from doc_translator.config import load_local_config
 from doc_translator.glossary import Glossary
+from doc_translator.json_utils import json_dumps
 from doc_translator.translator import TranslationConfig
 from doc_translator.translator import create_translator
 from doc_translator.web_state import make_initial_state
@@ -29,11 +59,68 @@ from doc_translator.web_state import write_state
 
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_UPLOAD_MB", "512")) * 1024 * 1024
 workspace_root = Path(__file__).resolve().parent
 jobs_root = workspace_root / "web_runs"
+LOCAL_CONFIG_PATH = workspace_root / "local.config.json"
 jobs_root.mkdir(parents=True, exist_ok=True)
 
 _jobs: dict[str, dict[str, Any]] = {}
+# job_id -> ((st_ino, st_mtime_ns, st_size), state), in LRU order; polls re-parse job_state.json only after it changes
+# (write_state replaces the file, so every rewrite gets a new inode even within one mtime tick).
+_state_cache: OrderedDict[str, tuple[tuple[int, int, int], dict[str, Any]]] = OrderedDict()
+_state_cache_lock = threading.Lock()
+STATE_CACHE_MAX_ENTRIES = 1024
+# Outputs that are already compressed containers or media; deflating them again gains almost nothing.
+_PRECOMPRESSED_SUFFIXES = frozenset({".docx", ".pptx", ".xlsx", ".pdf", ".png", ".jpg", ".zip"})
+_DOWNLOAD_CHUNK_SIZE = 1 << 16
+ZIP_WORKERS = min(8, os.cpu_count() or 1)
+# Larger entries are deflated inline while streaming instead of being held in memory by the pool.
+_PARALLEL_DEFLATE_MAX_BYTES = 16 << 20
+# Cap on source bytes of entries deflated ahead and not yet written, per download.
+_ZIP_LOOKAHEAD_BYTES = 64 << 20
+# Interactive downloads favour speed; level 3 is zstd's default tier.
+ZSTD_DOWNLOAD_LEVEL = 3
+_TAIL_BLOCK_SIZE = 16384
+_UPLOAD_COPY_BUFFER_SIZE = 1 << 20
+_UPLOAD_READ_SIZE = 65536
+_JOB_FORM_FIELDS = (
+    "source",
+    "target",
+    "domain",
+    "provider",
+    "model",
+    "api_key",
+    "base_url",
+    "endpoint",
+    "batch_size",
+    "max_retries",
+    "rate_limit_rpm",
+    "max_parallel_files",
+    "suffix",
+)
+
+# Opt-in pool of prewarmed worker processes; jobs fall back to a fresh subprocess when all are busy.
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", "0"))
+_worker_pool: ProcessPoolExecutor | None = None
+_worker_pool_busy = 0
+_worker_pool_lock = threading.Lock()
+
+TX_CACHE_MAX_ENTRIES = 10000
+TX_CACHE_TTL_SECONDS = 24 * 3600
+# key -> (stored_at, translation), in LRU order.
+_tx_cache: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+_tx_cache_lock = threading.Lock()
+
+TRANSLATOR_CACHE_SIZE = 32
+# Reusing translators keeps their HTTP connection pools and rate-limit state across requests.
+_translator_cache: OrderedDict[str, Any] = OrderedDict()
+_translator_cache_lock = threading.Lock()
+# id(translator) -> requests currently using it; evicted instances are closed only once this drops to 0.
+_translator_users: dict[int, int] = {}
+_translator_retired: dict[int, Any] = {}
+
+DEFAULT_TEXT_BATCH_WINDOW_MS = 50
 
 
 @app.get("/")
@@ -50,7 +137,7 @@ def office_addin_page():
 def office_addin_manifest():
     manifest_path = workspace_root / "office_addin" / "manifest.xml"
     if not manifest_path.exists():
-        return jsonify({"error": "manifest 不存在"}), 404
+        return _json({"error": "manifest 不存在"}, 404)
 
     response = make_response(manifest_path.read_text(encoding="utf-8"))
     response.headers["Content-Type"] = "application/xml; charset=utf-8"
@@ -59,26 +146,28 @@ def office_addin_manifest():
 
 @app.post("/api/jobs")
 def create_job():
-    files = request.files.getlist("files")
-    valid_files = [file for file in files if file and file.filename]
-    if not valid_files:
-        return jsonify({"error": "请至少选择一个文件"}), 400
-
     job_id = uuid.uuid4().hex[:12]
     job_dir = jobs_root / job_id
     input_dir = job_dir / "input"
     output_dir = job_dir / "output"
     input_dir.mkdir(parents=True, exist_ok=True)
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    for file in valid_files:
-        safe_name = secure_filename(file.filename)
-        if not safe_name:
-            continue
-        file.save(input_dir / safe_name)
+    try:
+        form, saved_files = _receive_job_upload(input_dir)
+    except HTTPException:
+        # e.g. body over MAX_CONTENT_LENGTH or client disconnect; keep Werkzeug's status.
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+    except Exception as exc:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return _json({"error": f"上传内容解析失败: {exc}"}, 400)
+    if not saved_files:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return _json({"error": "请至少选择一个文件"}, 400)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    local_config = load_local_config(str(workspace_root / "local.config.json"))
-    provider = request.form.get("provider", "openai")
+    local_config = _local_config()
+    provider = form.get("provider", "openai")
     provider_lower = provider.strip().lower()
 
     if provider_lower == "openai":
@@ -89,29 +178,32 @@ def create_job():
         endpoint_default = str(local_config.get("LLM_ENDPOINT", "/chat/completions"))
 
     config_payload: dict[str, Any] = {
-        "source": request.form.get("source", "zh"),
-        "target": request.form.get("target", "en"),
-        "domain": request.form.get("domain", "general"),
+        "source": form.get("source", "zh"),
+        "target": form.get("target", "en"),
+        "domain": form.get("domain", "general"),
         "provider": provider,
-        "model": request.form.get("model", "") or str(local_config.get("LLM_MODEL", local_config.get("OPENAI_MODEL", ""))),
-        "api_key": request.form.get("api_key", "") or str(local_config.get("OPEN_API_KEY", "")),
-        "base_url": request.form.get("base_url", "") or base_url_default,
-        "endpoint": request.form.get("endpoint", "/chat/completions") or endpoint_default,
-        "batch_size": int(request.form.get("batch_size", "20")),
-        "max_retries": int(request.form.get("max_retries", "3")),
-        "rate_limit_rpm": int(request.form.get("rate_limit_rpm", "60")),
-        "suffix": request.form.get("suffix", "") or request.form.get("target", "en"),
+        "model": form.get("model", "") or str(local_config.get("LLM_MODEL", local_config.get("OPENAI_MODEL", ""))),
+        "api_key": form.get("api_key", "") or str(local_config.get("OPEN_API_KEY", "")),
+        "base_url": form.get("base_url", "") or base_url_default,
+        "endpoint": form.get("endpoint", "/chat/completions") or endpoint_default,
+        "batch_size": int(form.get("batch_size", "20")),
+        "max_retries": int(form.get("max_retries", "3")),
+        "rate_limit_rpm": int(form.get("rate_limit_rpm", "60")),
+        "max_parallel_files": int(form.get("max_parallel_files", "4")),
+        "suffix": form.get("suffix", "") or form.get("target", "en"),
     }
-    (job_dir / "job_config.json").write_text(
-        json.dumps(config_payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    (job_dir / "job_config.json").write_bytes(json_dumps(config_payload, indent=True))
 
-    state_file = job_dir / "job_state.json"
+    state_file = _state_path(job_id)
     state = make_initial_state(job_id=job_id, output_dir=output_dir, log_path=output_dir / "logs" / "translator.log")
+    # Written before the worker starts, since the worker refuses to run without a state file; only the pid is patched later.
+    state["message"] = "任务已启动，等待worker执行"
     write_state(state_file, state)
     _jobs[job_id] = state
 
+    if _submit_to_worker_pool(job_id):
+        return _json({"job_id": job_id})
+
     cmd = [
         sys.executable,
         "-m",
@@ -136,11 +228,7 @@ def create_job():
             start_new_session=True,
             creationflags=creationflags,
         )
-        patch_state(
-            state_file,
-            message="任务已启动，等待worker执行",
-            pid=int(proc.pid),
-        )
+        patch_state(state_file, pid=int(proc.pid))
     except Exception as exc:
         patch_state(
             state_file,
@@ -148,9 +236,9 @@ def create_job():
             message="任务启动失败",
             error=str(exc),
         )
-        return jsonify({"error": f"任务启动失败: {exc}"}), 500
+        return _json({"error": f"任务启动失败: {exc}"}, 500)
 
-    return jsonify({"job_id": job_id})
+    return _json({"job_id": job_id})
 
 
 @app.post("/api/translate_text")
@@ -158,16 +246,22 @@ def translate_text():
     payload = request.get_json(silent=True) or {}
     text = str(payload.get("text", ""))
     if not text.strip():
-        return jsonify({"error": "text 不能为空"}), 400
+        return _json({"error": "text 不能为空"}, 400)
 
     try:
         config = _build_translation_config(payload)
-        translator = create_translator(config)
-        translated_text = _translate_texts_with_optional_glossary([text], translator, payload)[0]
+        with _use_translator(config) as translator:
+            translated_text = _translate_texts_with_optional_glossary(
+                [text],
+                translator,
+                translator.config,
+                payload,
+                coalesce=True,
+            )[0]
     except Exception as exc:
-        return jsonify({"error": f"翻译失败: {exc}"}), 500
+        return _json({"error": f"翻译失败: {exc}"}, 500)
 
-    return jsonify({"translated_text": translated_text})
+    return _json({"translated_text": translated_text})
 
 
 @app.post("/api/translate_batch")
@@ -175,93 +269,577 @@ def translate_batch():
     payload = request.get_json(silent=True) or {}
     texts = payload.get("texts")
     if not isinstance(texts, list) or not texts:
-        return jsonify({"error": "texts 不能为空数组"}), 400
+        return _json({"error": "texts 不能为空数组"}, 400)
 
     normalized_texts = [str(item) for item in texts]
 
     try:
         config = _build_translation_config(payload)
-        translator = create_translator(config)
-        translations = _translate_texts_with_optional_glossary(normalized_texts, translator, payload)
+        with _use_translator(config) as translator:
+            translations = _translate_texts_with_optional_glossary(normalized_texts, translator, translator.config, payload)
     except Exception as exc:
-        return jsonify({"error": f"翻译失败: {exc}"}), 500
+        return _json({"error": f"翻译失败: {exc}"}, 500)
 
-    return jsonify({"translations": translations})
+    return _json({"translations": translations})
 
 
 @app.get("/api/jobs/<job_id>")
 def get_job(job_id: str):
     state = _read_job_state(job_id)
     if not state:
-        return jsonify({"error": "任务不存在"}), 404
+        return _json({"error": "任务不存在"}, 404)
     _jobs[job_id] = state
-    return jsonify(state)
+    return _json(state)
 
 
 @app.get("/api/jobs/<job_id>/logs")
 def get_job_logs(job_id: str):
     state = _read_job_state(job_id)
     if not state:
-        return jsonify({"error": "任务不存在"}), 404
+        return _json({"error": "任务不存在"}, 404)
 
     tail = int(request.args.get("tail", "120"))
     tail = max(10, min(1000, tail))
-    log_file = Path(str(state.get("log_path") or (jobs_root / job_id / "output" / "logs" / "translator.log")))
+    log_file = _log_path(job_id, str(state.get("log_path") or ""))
+    status = str(state.get("status", "queued"))
+    if request.accept_mimetypes.best == "text/plain":
+        body = _tail_stream(log_file, tail) if log_file.exists() else iter(())
+        return Response(body, mimetype="text/plain", headers={"X-Job-Status": status})
     if not log_file.exists():
-        return jsonify({"logs": [], "status": state.get("status", "queued")})
+        return _json({"logs": [], "status": state.get("status", "queued")})
 
-    lines = log_file.read_text(encoding="utf-8", errors="replace").splitlines()
-    return jsonify({"logs": lines[-tail:], "status": state.get("status", "queued")})
+    return _json({"logs": _tail_lines(log_file, tail), "status": state.get("status", "queued")})
 
 
 @app.get("/api/jobs/<job_id>/download")
 def download_job(job_id: str):
     state = _read_job_state(job_id)
     if not state:
-        return jsonify({"error": "任务不存在"}), 404
+        return _json({"error": "任务不存在"}, 404)
     if state.get("status") != "completed":
-        return jsonify({"error": "任务尚未完成"}), 400
+        return _json({"error": "任务尚未完成"}, 400)
 
     output_dir = Path(str(state.get("output_dir", "")))
     if not output_dir.exists():
-        return jsonify({"error": "输出目录不存在"}), 404
+        return _json({"error": "输出目录不存在"}, 404)
+
+    raw_level = request.args.get("compression_level")
+    compression_level = _to_int(raw_level, -1) if raw_level is not None else None
+    if compression_level is not None and not 0 <= compression_level <= 9:
+        return _json({"error": "compression_level 需为 0-9"}, 400)
+
+    archive_format = request.args.get("format", "zip")
+    if archive_format not in {"zip", "zst"}:
+        return _json({"error": "format 仅支持 zip 或 zst"}, 400)
+    if archive_format == "zst" and zstandard is None:
+        return _json({"error": "服务器缺少依赖 zstandard，无法生成 .tar.zst"}, 400)
+
+    stats = [(file, file.stat()) for file in output_dir.rglob("*") if file.is_file()]
+    entries = [(file, stat.st_size) for file, stat in stats]
+    if archive_format == "zst":
+        suffix, mimetype, variant = ".tar.zst", "application/zstd", f"zst-{ZSTD_DOWNLOAD_LEVEL}"
+    else:
+        compression, compresslevel = _choose_zip_compression(entries, compression_level)
+        suffix, mimetype, variant = ".zip", "application/zip", f"zip-{compression}-{compresslevel}"
+
+    etag = _archive_etag(output_dir, stats, variant)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=3600"}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    download_name = f"{job_id}_output{suffix}"
+    cache_path = _state_path(job_id).parent / f"archive_{etag}{suffix}"
+    if cache_path.exists():
+        response = send_file(cache_path, mimetype=mimetype, as_attachment=True, download_name=download_name, etag=False)
+        response.headers.update(headers)
+        return response
+
+    if archive_format == "zst":
+        chunks = _stream_tar_zst(entries, output_dir)
+    else:
+        chunks = _stream_zip(entries, output_dir, compression, compresslevel)
+    headers["Content-Disposition"] = f"attachment; filename={download_name}"
+    return Response(_tee_archive(chunks, cache_path, suffix), mimetype=mimetype, headers=headers)
+
+
+def _archive_etag(output_dir: Path, stats: list[tuple[Path, os.stat_result]], variant: str) -> str:
+    # The archive is a pure function of the output manifest and the format options.
+    digest = hashlib.blake2b(variant.encode("utf-8"), digest_size=8)
+    for file, stat in stats:
+        digest.update(f"\n{file.relative_to(output_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
 
-    zip_path = output_dir.parent / f"{job_id}_output.zip"
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for file in output_dir.rglob("*"):
-            if file.is_file():
-                zf.write(file, arcname=file.relative_to(output_dir))
-    return send_file(zip_path, as_attachment=True, download_name=zip_path.name)
+
+def _tee_archive(chunks: Iterator[bytes], cache_path: Path, suffix: str) -> Iterator[bytes]:
+    # Stream to the client while writing the same bytes aside; only a fully sent archive is kept.
+    fd, temp_name = tempfile.mkstemp(prefix=".archive-", suffix=".tmp", dir=cache_path.parent)
+    completed = False
+    try:
+        with os.fdopen(fd, "wb") as cache_file:
+            for chunk in chunks:
+                cache_file.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        chunks.close()
+        if completed:
+            os.replace(temp_name, cache_path)
+            for stale in cache_path.parent.glob(f"archive_*{suffix}"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        else:
+            Path(temp_name).unlink(missing_ok=True)
+
+
+class _ZipStreamBuffer:
+    # Write-only sink: without tell()/seek(), zipfile emits data descriptors and never rewinds.
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _stream_zip(
+    entries: list[tuple[Path, int]],
+    output_dir: Path,
+    compression: int,
+    compresslevel: int | None,
+) -> Iterator[bytes]:
+    buffer = _ZipStreamBuffer()
+    # Deflated entries are compressed ahead in the pool (zlib releases the GIL) and written back in order
+    # here; stored entries stream in a single pass, with zipfile computing the CRC as it writes.
+    parallel = compression == zipfile.ZIP_DEFLATED and ZIP_WORKERS > 1 and len(entries) > 1
+    executor = ThreadPoolExecutor(max_workers=ZIP_WORKERS) if parallel else None
+    queued: deque[tuple[Path, int, Future[Any] | None, int]] = deque()
+    next_index = 0
+    held_bytes = 0
+
+    def fill_queue() -> None:
+        nonlocal next_index, held_bytes
+        while next_index < len(entries) and len(queued) < ZIP_WORKERS * 2:
+            file, size = entries[next_index]
+            future = None
+            held = 0
+            if executor is not None and size <= _PARALLEL_DEFLATE_MAX_BYTES:
+                if held_bytes and held_bytes + size > _ZIP_LOOKAHEAD_BYTES:
+                    return
+                future = executor.submit(_deflate_file, file, compresslevel)
+                held = size
+            held_bytes += held
+            queued.append((file, size, future, held))
+            next_index += 1
+
+    try:
+        with zipfile.ZipFile(buffer, "w", compression=compression, compresslevel=compresslevel) as zf:
+            fill_queue()
+            while queued:
+                file, size, future, held = queued.popleft()
+                fill_queue()
+                info = zipfile.ZipInfo.from_file(file, arcname=str(file.relative_to(output_dir)))
+                info.compress_type = compression
+                info._compresslevel = compresslevel
+                if future is None:
+                    with file.open("rb") as source, zf.open(info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as target:
+                        while chunk := source.read(_DOWNLOAD_CHUNK_SIZE):
+                            target.write(chunk)
+                            if buffer.chunks:
+                                yield buffer.drain()
+                else:
+                    crc, raw_size, data = future.result()
+                    _write_entry_header(zf, info, crc, raw_size, len(data))
+                    zf.fp.write(data)
+                    _finish_entry(zf, info)
+                    # Drop every reference to the deflated bytes before the budget is released.
+                    future = data = None
+                if buffer.chunks:
+                    yield buffer.drain()
+                held_bytes -= held
+        yield buffer.drain()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _stream_tar_zst(entries: list[tuple[Path, int]], output_dir: Path) -> Iterator[bytes]:
+    buffer = _ZipStreamBuffer()
+    compressor = zstandard.ZstdCompressor(level=ZSTD_DOWNLOAD_LEVEL)
+    with compressor.stream_writer(buffer, closefd=False) as writer:
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            for file, _size in entries:
+                info = tar.gettarinfo(str(file), arcname=str(file.relative_to(output_dir)))
+                # Mirrors TarFile.addfile, but copies the member in chunks so compressed output can be
+                # yielded as it is produced instead of after the whole member.
+                header = info.tobuf(tar.format, tar.encoding, tar.errors)
+                tar.fileobj.write(header)
+                remaining = info.size
+                with file.open("rb") as source:
+                    while remaining > 0 and (chunk := source.read(min(_DOWNLOAD_CHUNK_SIZE, remaining))):
+                        remaining -= len(chunk)
+                        tar.fileobj.write(chunk)
+                        if buffer.chunks:
+                            yield buffer.drain()
+                if remaining:
+                    raise RuntimeError(f"文件在打包过程中被截断: {file}")
+                padding = -info.size % tarfile.BLOCKSIZE
+                if padding:
+                    tar.fileobj.write(tarfile.NUL * padding)
+                tar.offset += len(header) + info.size + padding
+                tar.members.append(info)
+                if buffer.chunks:
+                    yield buffer.drain()
+    yield buffer.drain()
+
+
+def _deflate_file(file: Path, compresslevel: int | None) -> tuple[int, int, bytes]:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel, zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+    parts: list[bytes] = []
+    with file.open("rb") as source:
+        while chunk := source.read(_DOWNLOAD_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            parts.append(compressor.compress(chunk))
+    parts.append(compressor.flush())
+    return crc, size, b"".join(parts)
+
+
+# zipfile has no public API for members whose CRC and sizes are known in advance;
+# these mirror what ZipFile.open("w") does around the payload.
+def _write_entry_header(zf: zipfile.ZipFile, info: zipfile.ZipInfo, crc: int, size: int, compress_size: int) -> None:
+    info.CRC = crc
+    info.file_size = size
+    info.compress_size = compress_size
+    zf._writecheck(info)
+    info.header_offset = zf.fp.tell()
+    zf.fp.write(info.FileHeader())
+
+
+def _finish_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    zf.start_dir = zf.fp.tell()
+    zf._didModify = True
+
+
+def _choose_zip_compression(entries: list[tuple[Path, int]], compression_level: int | None) -> tuple[int, int | None]:
+    if compression_level is not None:
+        if compression_level == 0:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, compression_level
+
+    total_bytes = sum(size for _file, size in entries)
+    precompressed_bytes = sum(size for file, size in entries if file.suffix.lower() in _PRECOMPRESSED_SUFFIXES)
+    if total_bytes and precompressed_bytes * 2 > total_bytes:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, 1
+
+
+def _start_worker_pool() -> None:
+    global _worker_pool
+    with _worker_pool_lock:
+        if WEB_WORKERS <= 0 or _worker_pool is not None:
+            return
+        # Imported here so the web process only loads the adapter stack when the pool is enabled.
+        from doc_translator.web_worker import prewarm
+
+        # spawn: the pool may start after waitress threads exist, and forking a threaded process is unsafe.
+        _worker_pool = ProcessPoolExecutor(max_workers=WEB_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        for _ in range(WEB_WORKERS):
+            _worker_pool.submit(prewarm)
+
+
+def _submit_to_worker_pool(job_id: str) -> bool:
+    global _worker_pool, _worker_pool_busy
+    _start_worker_pool()
+    with _worker_pool_lock:
+        if _worker_pool is None or _worker_pool_busy >= WEB_WORKERS:
+            return False
+        from doc_translator.web_worker import run_job
+
+        try:
+            future = _worker_pool.submit(run_job, jobs_root, job_id)
+        except RuntimeError:
+            # Broken pool (a worker died): drop it so the next job starts a fresh one.
+            _worker_pool = None
+            return False
+        _worker_pool_busy += 1
+    future.add_done_callback(functools.partial(_on_pool_job_done, job_id))
+    return True
+
+
+def _on_pool_job_done(job_id: str, future: Future[None]) -> None:
+    global _worker_pool_busy
+    with _worker_pool_lock:
+        _worker_pool_busy -= 1
+    exc = None if future.cancelled() else future.exception()
+    if exc is not None:
+        patch_state(
+            _state_path(job_id),
+            status="failed",
+            message="任务失败",
+            error=str(exc),
+        )
+
+
+def _receive_job_upload(input_dir: Path) -> tuple[dict[str, str], list[Path]]:
+    if StreamingFormDataParser is None or request.mimetype != "multipart/form-data":
+        saved_files: list[Path] = []
+        for file in request.files.getlist("files"):
+            safe_name = secure_filename(file.filename or "") if file else ""
+            if not safe_name:
+                continue
+            _save_upload(file.stream, input_dir / safe_name)
+            saved_files.append(input_dir / safe_name)
+        return request.form.to_dict(), saved_files
+
+    # Parse the multipart body straight from the request stream; file parts go to disk as they arrive.
+    parser = StreamingFormDataParser(headers=request.headers)
+    uploads = _UploadDirectoryTarget(input_dir)
+    fields = {name: _FormValueTarget() for name in _JOB_FORM_FIELDS}
+    parser.register("files", uploads)
+    for name, target in fields.items():
+        parser.register(name, target)
+    # The parser accepts a body that simply stops; a missing closing delimiter means it was truncated.
+    closing = b"--" + request.mimetype_params.get("boundary", "").encode("latin-1") + b"--"
+    tail = b""
+    try:
+        while chunk := request.stream.read(_UPLOAD_READ_SIZE):
+            parser.data_received(chunk)
+            tail = (tail + chunk)[-(len(closing) + 4) :]
+    finally:
+        uploads.finish()
+    if closing not in tail:
+        raise ValueError("multipart 请求体不完整")
+    form = {name: target.value for name, target in fields.items() if target.received}
+    return form, uploads.saved_files
+
+
+class _UploadDirectoryTarget:
+    # streaming-form-data target for the repeated "files" part; each part is written under its sanitized name.
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.saved_files: list[Path] = []
+        self._filename = ""
+        self._file: BinaryIO | None = None
+
+    def set_multipart_filename(self, filename: str) -> None:
+        self._filename = filename or ""
+
+    def set_multipart_content_type(self, _content_type: str) -> None:
+        pass
+
+    def start(self) -> None:
+        self.finish()
+        safe_name = secure_filename(self._filename)
+        if safe_name:
+            path = self.directory / safe_name
+            self._file = open(path, "wb")
+            self.saved_files.append(path)
+
+    def data_received(self, chunk: bytes) -> None:
+        if self._file is not None:
+            self._file.write(chunk)
+
+    def finish(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _FormValueTarget:
+    def __init__(self) -> None:
+        self.received = False
+        self._chunks: list[bytes] = []
+
+    def set_multipart_filename(self, _filename: str) -> None:
+        pass
+
+    def set_multipart_content_type(self, _content_type: str) -> None:
+        pass
+
+    def start(self) -> None:
+        self.received = True
+        self._chunks.clear()
+
+    def data_received(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+
+    def finish(self) -> None:
+        pass
+
+    @property
+    def value(self) -> str:
+        return b"".join(self._chunks).decode("utf-8", errors="replace")
+
+
+def _save_upload(stream, target: Path) -> None:
+    stream.seek(0)
+    with open(target, "wb", buffering=0) as dst:
+        source_fd = _upload_fileno(stream)
+        if source_fd is not None and hasattr(os, "sendfile"):
+            try:
+                size = os.fstat(source_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), source_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError:
+                stream.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(stream, dst, length=_UPLOAD_COPY_BUFFER_SIZE)
+
+
+def _upload_fileno(stream) -> int | None:
+    # fileno() would force an in-memory SpooledTemporaryFile to disk; only use uploads that already live in a file.
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        return None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _tail_lines(path: Path, count: int) -> list[str]:
+    with path.open("rb") as file:
+        file.seek(_tail_offset(file, count))
+        data = file.read()
+    return data.decode("utf-8", errors="replace").splitlines()[-count:]
+
+
+def _tail_stream(path: Path, count: int) -> Iterator[bytes]:
+    with path.open("rb") as file:
+        offset = _tail_offset(file, count)
+        remaining = file.seek(0, os.SEEK_END) - offset
+        file.seek(offset)
+        while remaining > 0 and (chunk := file.read(min(_DOWNLOAD_CHUNK_SIZE, remaining))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _tail_offset(file: BinaryIO, count: int) -> int:
+    # Scan backwards block by block for the newline that precedes the last `count` lines.
+    end = file.seek(0, os.SEEK_END)
+    if end == 0:
+        return 0
+    file.seek(end - 1)
+    needed = count + 1 if file.read(1) == b"\n" else count
+    position = end
+    while position > 0:
+        step = min(_TAIL_BLOCK_SIZE, position)
+        position -= step
+        file.seek(position)
+        block = file.read(step)
+        index = len(block)
+        while (index := block.rfind(b"\n", 0, index)) >= 0:
+            needed -= 1
+            if needed == 0:
+                return position + index + 1
+    return 0
+
+
+def _json(payload: Any, status: int = 200) -> Response:
+    return Response(json_dumps(payload), status=status, mimetype="application/json")
+
+
+# Polled endpoints resolve the same paths on every request; keep the Path objects around.
+@functools.lru_cache(maxsize=1024)
+def _state_path(job_id: str) -> Path:
+    return jobs_root / job_id / "job_state.json"
+
+
+@functools.lru_cache(maxsize=1024)
+def _log_path(job_id: str, recorded_path: str) -> Path:
+    if recorded_path:
+        return Path(recorded_path)
+    return jobs_root / job_id / "output" / "logs" / "translator.log"
 
 
 def _read_job_state(job_id: str) -> dict[str, Any]:
-    state_file = jobs_root / job_id / "job_state.json"
-    state = read_state(state_file)
-    if not state:
+    state_file = _state_path(job_id)
+    try:
+        stat = state_file.stat()
+    except OSError:
         return {}
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _state_cache_lock:
+        cached = _state_cache.get(job_id)
+        if cached is not None:
+            _state_cache.move_to_end(job_id)
+    if cached is not None and cached[0] == signature:
+        state = cached[1]
+    else:
+        state = read_state(state_file)
+        if not state:
+            return {}
+        _remember_state(job_id, signature, state)
 
-    status = str(state.get("status", ""))
-    pid = int(state.get("pid", 0) or 0)
-    if status in {"queued", "running"} and pid > 0 and not is_pid_alive(pid):
-        report_file = Path(str(state.get("report_path", "")))
-        if report_file.exists():
-            state = patch_state(
-                state_file,
-                status="completed",
-                message="任务完成",
-                overall_percent=100,
-            )
-        else:
-            state = patch_state(
-                state_file,
-                status="failed",
-                message="任务进程已退出",
-                error="worker process exited unexpectedly",
-            )
+    updates = _dead_worker_updates(state)
+    if updates is None:
+        return state
 
+    state = patch_state(state_file, **updates)
+    try:
+        stat = state_file.stat()
+    except OSError:
+        return state
+    _remember_state(job_id, (stat.st_ino, stat.st_mtime_ns, stat.st_size), state)
     return state
 
 
+def _remember_state(job_id: str, signature: tuple[int, int, int], state: dict[str, Any]) -> None:
+    with _state_cache_lock:
+        _state_cache[job_id] = (signature, state)
+        _state_cache.move_to_end(job_id)
+        while len(_state_cache) > STATE_CACHE_MAX_ENTRIES:
+            _state_cache.popitem(last=False)
+
+
+def _dead_worker_updates(state: dict[str, Any]) -> dict[str, Any] | None:
+    # Only a queued/running job whose worker pid is gone needs a transition; everything else is left untouched.
+    if str(state.get("status", "")) not in {"queued", "running"}:
+        return None
+    pid = int(state.get("pid", 0) or 0)
+    if pid <= 0 or is_pid_alive(pid):
+        return None
+    report_path = str(state.get("report_path") or "")
+    if report_path and Path(report_path).exists():
+        return {"status": "completed", "message": "任务完成", "overall_percent": 100}
+    return {
+        "status": "failed",
+        "message": "任务进程已退出",
+        "error": "worker process exited unexpectedly",
+    }
+
+
+def _local_config() -> dict[str, Any]:
+    try:
+        mtime_ns = LOCAL_CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    return _cached_local_config(mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_local_config(_mtime_ns: int) -> dict[str, Any]:
+    # Keyed on mtime so edits to local.config.json are picked up without a restart.
+    return load_local_config(str(LOCAL_CONFIG_PATH))
+
+
 def _to_int(value: Any, default_value: int) -> int:
     try:
         return int(value)
@@ -270,7 +848,7 @@ def _to_int(value: Any, default_value: int) -> int:
 
 
 def _build_translation_config(payload: dict[str, Any]) -> TranslationConfig:
-    local_config = load_local_config(str(workspace_root / "local.config.json"))
+    local_config = _local_config()
     provider = str(payload.get("provider", "") or local_config.get("LLM_PROVIDER", "openai"))
     provider_lower = provider.strip().lower()
 
@@ -296,6 +874,64 @@ def _build_translation_config(payload: dict[str, Any]) -> TranslationConfig:
     )
 
 
+@contextlib.contextmanager
+def _use_translator(config: TranslationConfig) -> Iterator[Any]:
+    # The use count covers coalesced _TextBatcher flushes too: the request waits for its slot inside this block.
+    translator = _acquire_translator(config)
+    try:
+        yield translator
+    finally:
+        with _translator_cache_lock:
+            remaining = _translator_users.pop(id(translator)) - 1
+            if remaining:
+                _translator_users[id(translator)] = remaining
+                translator = None
+            else:
+                translator = _translator_retired.pop(id(translator), None)
+        _close_translator(translator)
+
+
+def _acquire_translator(config: TranslationConfig):
+    # Hash before create_translator, which fills in the API key and model on the config.
+    key = hashlib.blake2b(repr(astuple(config)).encode("utf-8"), digest_size=16).hexdigest()
+    with _translator_cache_lock:
+        translator = _translator_cache.get(key)
+        if translator is not None:
+            _translator_cache.move_to_end(key)
+            _translator_users[id(translator)] = _translator_users.get(id(translator), 0) + 1
+            return translator
+
+    created = create_translator(config)
+    if hasattr(created, "memo_size"):
+        # _tx_cache fronts these long-lived instances with a TTL; a memo without one would outlive it.
+        created.memo_size = 0
+    idle: list[Any] = []
+    with _translator_cache_lock:
+        translator = _translator_cache.get(key)
+        if translator is not None:
+            idle.append(created)
+        else:
+            translator = created
+            _translator_cache[key] = translator
+            while len(_translator_cache) > TRANSLATOR_CACHE_SIZE:
+                evicted = _translator_cache.popitem(last=False)[1]
+                if id(evicted) in _translator_users:
+                    _translator_retired[id(evicted)] = evicted
+                else:
+                    idle.append(evicted)
+        _translator_users[id(translator)] = _translator_users.get(id(translator), 0) + 1
+    for stale in idle:
+        _close_translator(stale)
+    return translator
+
+
+def _close_translator(translator) -> None:
+    # Releases the HTTP connection pool; only called once no request is using the instance.
+    close = getattr(translator, "close", None)
+    if close:
+        close()
+
+
 def _parse_bool(value: Any) -> bool:
     if isinstance(value, bool):
         return value
@@ -304,29 +940,172 @@ def _parse_bool(value: Any) -> bool:
     return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-def _translate_texts_with_optional_glossary(texts: list[str], translator, payload: dict[str, Any]) -> list[str]:
+def _translate_texts_with_optional_glossary(
+    texts: list[str],
+    translator,
+    config: TranslationConfig,
+    payload: dict[str, Any],
+    coalesce: bool = False,
+) -> list[str]:
     use_glossary = _parse_bool(payload.get("use_glossary"))
     glossary_path = str(payload.get("glossary_path", "")).strip()
 
     if not use_glossary:
-        return translator.translate(texts)
+        return _translate_unique(texts, translator, config, coalesce)
+
+    glossary = _load_glossary(glossary_path)
+    preprocessed_texts, placeholders_list, _ = glossary.preprocess_locks_batch(texts)
+    translated = _translate_unique(preprocessed_texts, translator, config, coalesce)
+    return [
+        glossary.postprocess(text, placeholders)[0]
+        for text, placeholders in zip(translated, placeholders_list)
+    ]
+
 
-    glossary = Glossary.load(glossary_path)
-    preprocessed_texts: list[str] = []
-    placeholders_list: list[dict[str, str]] = []
+def _translate_unique(texts: list[str], translator, config: TranslationConfig, coalesce: bool) -> list[str]:
+    # Repeated segments are translated once and scattered back to every position.
+    unique: dict[str, int] = {}
+    indices = [unique.setdefault(text, len(unique)) for text in texts]
+    if len(unique) == len(texts):
+        return _translate_cached(texts, translator, config, coalesce)
+    results = _translate_cached(list(unique), translator, config, coalesce)
+    return [results[index] for index in indices]
 
-    for text in texts:
-        updated_text, placeholders, _ = glossary.preprocess_locks(text)
-        preprocessed_texts.append(updated_text)
-        placeholders_list.append(placeholders)
 
-    translated = translator.translate(preprocessed_texts)
-    finalized: list[str] = []
-    for index, text in enumerate(translated):
-        post_text, _ = glossary.postprocess(text, placeholders_list[index])
-        finalized.append(post_text)
-    return finalized
+def _load_glossary(glossary_path: str) -> Glossary:
+    try:
+        mtime_ns = Path(glossary_path).stat().st_mtime_ns if glossary_path else 0
+    except OSError:
+        return Glossary.load(glossary_path)
+    return _cached_glossary(glossary_path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_glossary(glossary_path: str, _mtime_ns: int) -> Glossary:
+    # Compiling the lock/force patterns dominates small requests; reuse them until the file changes.
+    return Glossary.load(glossary_path)
+
+
+def _translate_cached(texts: list[str], translator, config: TranslationConfig, coalesce: bool = False) -> list[str]:
+    # 16-byte BLAKE2b digests keep cache keys small however long the source text is.
+    key_prefix = hashlib.blake2b(
+        f"{config.provider}|{config.model}|{config.source_lang}|{config.target_lang}|{config.domain}|".encode("utf-8"),
+        digest_size=16,
+    )
+    keys = [_tx_cache_key(key_prefix, text) for text in texts]
+    results: list[str | None] = []
+    now = time.time()
+    with _tx_cache_lock:
+        for key in keys:
+            entry = _tx_cache.get(key)
+            if entry is not None and now - entry[0] < TX_CACHE_TTL_SECONDS:
+                _tx_cache.move_to_end(key)
+                results.append(entry[1])
+            else:
+                _tx_cache.pop(key, None)
+                results.append(None)
+
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        missing_texts = [texts[index] for index in missing]
+        window_ms = _to_int(_local_config().get("TEXT_BATCH_WINDOW_MS", DEFAULT_TEXT_BATCH_WINDOW_MS), 0)
+        if coalesce and window_ms > 0:
+            translated = _text_batcher.translate(translator, missing_texts, window_ms / 1000.0)
+        else:
+            translated = translator.translate(missing_texts)
+        stored_at = time.time()
+        with _tx_cache_lock:
+            for index, translated_text in zip(missing, translated):
+                results[index] = translated_text
+                _tx_cache[keys[index]] = (stored_at, translated_text)
+                _tx_cache.move_to_end(keys[index])
+            while len(_tx_cache) > TX_CACHE_MAX_ENTRIES:
+                _tx_cache.popitem(last=False)
+    return [result or "" for result in results]
+
+
+def _tx_cache_key(key_prefix: Any, text: str) -> bytes:
+    digest = key_prefix.copy()
+    digest.update(text.encode("utf-8"))
+    return digest.digest()
+
+
+class _BatchSlot:
+    __slots__ = ("texts", "result", "error", "done")
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.result: list[str] = []
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+
+class _TextBatcher:
+    # Concurrent single-text requests for the same translator wait one window and share one translate() call.
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: dict[int, tuple[Any, list[_BatchSlot]]] = {}
+        self._window = DEFAULT_TEXT_BATCH_WINDOW_MS / 1000.0
+        self._thread: threading.Thread | None = None
+        # Each flush blocks on a translate() call; reuse a fixed set of threads rather than one per flush.
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get("WEB_THREADS", "8")),
+            thread_name_prefix="text-batch",
+        )
+
+    def translate(self, translator, texts: list[str], window: float) -> list[str]:
+        slot = _BatchSlot(texts)
+        with self._cond:
+            self._pending.setdefault(id(translator), (translator, []))[1].append(slot)
+            self._window = window
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="text-batcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                window = self._window
+            time.sleep(window)
+            with self._cond:
+                pending, self._pending = self._pending, {}
+            for translator, slots in pending.values():
+                self._executor.submit(self._flush, translator, slots)
+
+    @staticmethod
+    def _flush(translator, slots: list[_BatchSlot]) -> None:
+        try:
+            translated = translator.translate([text for slot in slots for text in slot.texts])
+        except Exception as exc:
+            for slot in slots:
+                slot.error = exc
+                slot.done.set()
+            return
+        cursor = 0
+        for slot in slots:
+            slot.result = translated[cursor : cursor + len(slot.texts)]
+            cursor += len(slot.texts)
+            slot.done.set()
+
+
+_text_batcher = _TextBatcher()
 
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5050, debug=True)
+    _start_worker_pool()
+    if os.environ.get("FLASK_DEBUG"):
+        app.run(host="127.0.0.1", port=5050, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ModuleNotFoundError:
+            app.run(host="127.0.0.1", port=5050, debug=True)
+        else:
+            serve(app, host="127.0.0.1", port=5050, threads=int(os.environ.get("WEB_THREADS", "8")))